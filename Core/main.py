@@ -3,6 +3,7 @@ import pandas as pd
 import numpy as np
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from itertools import chain, combinations
 from datetime import time
 import json
@@ -21,7 +22,7 @@ if project_root not in sys.path:
 from Core.data_handler import load_unified_data
 from Core.backtester import run_r_backtest
 from Core.analysis import get_performance_stats, export_scenario_to_excel
-from Core.strategy_base import BaseStrategy
+from Core.strategy_base import BaseStrategy, StrategyConditions
 
 def load_asset_config():
     """Loads asset configuration from the JSON file."""
@@ -92,40 +93,42 @@ def _run_backtest_scenarios(analysis_df: pd.DataFrame, conditions_df: pd.DataFra
     user_start_dt = pd.to_datetime(ny_start_date).date()
     user_end_dt = pd.to_datetime(ny_end_date).date()
 
+    # Extract the condition columns to raw arrays once; every filter
+    # combination below reuses them with plain ndarray ops.
+    cond = StrategyConditions.from_frame(conditions_df)
+    signal_tf = strategy_instance.STRATEGY_TIMEFRAME
+    open_col = f'open_{signal_tf}'
+    is_new_signal_candle = None
+    if open_col in analysis_df.columns:
+        open_arr = analysis_df[open_col].to_numpy()
+        is_new_signal_candle = np.empty(len(open_arr), dtype=bool)
+        if len(open_arr) > 0:
+            is_new_signal_candle[0] = True
+            np.not_equal(open_arr[1:], open_arr[:-1], out=is_new_signal_candle[1:])
+
     for filt_combo in filter_combinations:
         # 1. Combine base conditions with selected filters
-        final_mask = conditions_df['base_pattern_cond']
-        if 'session_cond' in conditions_df.columns:
-            final_mask &= conditions_df['session_cond']
+        final_mask = cond.base_pattern_cond.copy()
+        if cond.session_cond is not None:
+            final_mask &= cond.session_cond
 
         combo_name = "Base" if not filt_combo else "+".join(filt_combo)
         for filt in filt_combo:
-            final_mask &= conditions_df[f'filter_{filt}']
+            final_mask &= cond.filters[filt]
 
         # 2. Filter signals to the start of each new strategy candle
-        signal_tf = strategy_instance.STRATEGY_TIMEFRAME
-        open_col = f'open_{signal_tf}'
-        if open_col in analysis_df.columns:
-            is_new_signal_candle = analysis_df[open_col].ne(analysis_df[open_col].shift(1))
+        if is_new_signal_candle is not None:
             final_mask &= is_new_signal_candle
 
-        # 3. Create signal DataFrame
-        long_signal_mask = final_mask & conditions_df['is_bullish']
-        short_signal_mask = final_mask & conditions_df['is_bearish']
-
-        signals_df = pd.DataFrame(index=analysis_df.index)
-        signals_df['signal'] = 0
-        signals_df.loc[long_signal_mask, 'signal'] = 1
-        signals_df.loc[short_signal_mask, 'signal'] = -1
-        signals_df['entry_price'] = np.where(long_signal_mask, conditions_df['entry_price'], np.where(short_signal_mask, conditions_df['entry_price'], np.nan))
-        signals_df['sl_price'] = np.where(long_signal_mask, conditions_df['sl_price_long'], np.where(short_signal_mask, conditions_df['sl_price_short'], np.nan))
-
-        # 4. Merge signals into the main analysis DataFrame
-        analysis_df['signal'] = signals_df['signal']
-        analysis_df['entry_price'] = signals_df['entry_price']
-        analysis_df['sl_price'] = signals_df['sl_price']
-        
-        # 5. Run backtest for each R:R scenario
+        # 3. Assemble signal columns directly into the analysis DataFrame
+        long_signal_mask = final_mask & cond.is_bullish
+        short_signal_mask = final_mask & cond.is_bearish
+
+        analysis_df['signal'] = long_signal_mask.astype(np.int8) - short_signal_mask.astype(np.int8)
+        analysis_df['entry_price'] = np.where(long_signal_mask | short_signal_mask, cond.entry_price, np.nan)
+        analysis_df['sl_price'] = np.where(long_signal_mask, cond.sl_price_long, np.where(short_signal_mask, cond.sl_price_short, np.nan))
+
+        # 4. Run backtest for each R:R scenario
         backtest_df = analysis_df[analysis_df['ny_time'].dt.date.between(user_start_dt, user_end_dt)].copy()
         execution_timeframe = ASSET_CONFIG[asset_name]['base_tf']
 
@@ -235,4 +238,65 @@ def run_full_backtest(asset_name: str, ny_start_date: str, ny_end_date: str, rr_
     )
 
     log(f"\nFinished processing {asset_name}.")
-    return excel_filename
\ No newline at end of file
+    return excel_filename
+
+def _run_sweep_entry(asset_name: str, ny_start_date: str, ny_end_date: str, rr_scenarios: list,
+                     strategy_instance: BaseStrategy, strategy_params: dict, selected_filters: list,
+                     allow_multiple_trades: bool):
+    """Worker entry point for run_parameter_sweep; logs go to the worker's stdout."""
+    return run_full_backtest(
+        asset_name=asset_name,
+        ny_start_date=ny_start_date,
+        ny_end_date=ny_end_date,
+        rr_scenarios=rr_scenarios,
+        strategy_instance=strategy_instance,
+        strategy_params=strategy_params,
+        selected_filters=selected_filters,
+        allow_multiple_trades=allow_multiple_trades,
+        status_callback=None
+    )
+
+def run_parameter_sweep(asset_name: str, ny_start_date: str, ny_end_date: str, rr_scenarios: list,
+                        strategy_instance: BaseStrategy, param_grid: list, selected_filters: list = [],
+                        allow_multiple_trades: bool = False, max_workers: int = None,
+                        status_callback: callable = None) -> list:
+    """
+    Runs run_full_backtest once per parameter set, spread across processes.
+
+    Each backtest is an independent function of (data, params), so a session
+    or filter grid scales across cores. Workers load the asset data through
+    the normal pyarrow path and reuse the numba kernels compiled with
+    cache=True from disk, so neither the data deserialization nor the JIT
+    warm-up is repeated per parameter set within a worker.
+
+    Args:
+        param_grid: A list of strategy_params dicts, one backtest each.
+        max_workers: Process count; defaults to the machine's CPU count.
+
+    Returns:
+        A list of (strategy_params, excel_filename) tuples in grid order.
+    """
+    def log(message):
+        if status_callback:
+            status_callback(message)
+        else:
+            print(message)
+
+    log(f"\n-> Running parameter sweep: {len(param_grid)} parameter sets for {asset_name}...")
+    results = [None] * len(param_grid)
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(_run_sweep_entry, asset_name, ny_start_date, ny_end_date, rr_scenarios,
+                        strategy_instance, params, selected_filters, allow_multiple_trades): i
+            for i, params in enumerate(param_grid)
+        }
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                results[i] = (param_grid[i], future.result())
+                log(f"  - Completed parameter set {i + 1}/{len(param_grid)}: {param_grid[i]}")
+            except Exception as e:
+                results[i] = (param_grid[i], None)
+                log(f"  !!! Parameter set {i + 1}/{len(param_grid)} failed: {e}")
+    log("-> Parameter sweep finished.")
+    return results
\ No newline at end of file
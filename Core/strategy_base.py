@@ -1,9 +1,104 @@
 # In Core/strategy_base.py
 from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 
+def resampled_view(df: pd.DataFrame, tf: str) -> pd.DataFrame:
+    """
+    Returns the rows of `df` where a new `tf` candle starts.
+
+    The candle-start positions are computed once per (DataFrame, timeframe)
+    and cached in `df.attrs`, so repeated strategy runs on the same data
+    (parameter sweeps, re-running with different filters) skip the O(N)
+    scan and boolean-mask indexing and fall through to a positional take.
+    """
+    attr_key = f'_candle_pos_{tf}'
+    positions = df.attrs.get(attr_key)
+    if positions is None:
+        open_arr = df[f'open_{tf}'].to_numpy()
+        mask = np.empty(len(open_arr), dtype=bool)
+        if len(open_arr) > 0:
+            mask[0] = True
+            np.not_equal(open_arr[1:], open_arr[:-1], out=mask[1:])
+        positions = np.flatnonzero(mask)
+        df.attrs[attr_key] = positions
+    return df.iloc[positions].copy()
+
+
+def empty_conditions_df(index: pd.Index) -> pd.DataFrame:
+    """
+    Builds a no-signal conditions DataFrame with the standard schema.
+
+    Every column is created from a pre-typed array (bool flags, float64
+    prices), so strategies returning early on "no signals" hand downstream
+    code homogeneous blocks instead of object-dtype columns.
+    """
+    n = len(index)
+    return pd.DataFrame({
+        'base_pattern_cond': np.zeros(n, dtype=bool),
+        'is_bullish': np.zeros(n, dtype=bool),
+        'is_bearish': np.zeros(n, dtype=bool),
+        'session_cond': np.zeros(n, dtype=bool),
+        'entry_price': np.full(n, np.nan),
+        'sl_price_long': np.full(n, np.nan),
+        'sl_price_short': np.full(n, np.nan),
+    }, index=index)
+
+
+def ny_seconds_of_day(df: pd.DataFrame) -> np.ndarray:
+    """
+    Returns each row's New York wall-clock time as integer seconds-of-day.
+
+    Computed once per DataFrame and cached in `df.attrs`, this turns session
+    and killzone checks into plain int comparisons instead of allocating a
+    `datetime.time` object per row.
+    """
+    sod = df.attrs.get('_ny_sod')
+    if sod is None:
+        ny = df['ny_time'].dt if 'ny_time' in df.columns else df.index.tz_convert('America/New_York')
+        sod = np.asarray(ny.hour * 3600 + ny.minute * 60 + ny.second, dtype=np.int32)
+        df.attrs['_ny_sod'] = sod
+    return sod
+
+
+@dataclass(frozen=True)
+class StrategyConditions:
+    """
+    Struct-of-arrays view over a conditions DataFrame.
+
+    Backtest loops read the same handful of condition columns many times
+    (once per filter combination); extracting them to raw numpy arrays once
+    via `from_frame` replaces repeated pandas column dispatch with plain
+    ndarray ops. Strategies keep returning DataFrames — this is a
+    consumer-side view, not a change to the `generate_conditions` contract.
+    """
+    base_pattern_cond: np.ndarray
+    is_bullish: np.ndarray
+    is_bearish: np.ndarray
+    entry_price: np.ndarray
+    sl_price_long: np.ndarray
+    sl_price_short: np.ndarray
+    session_cond: Optional[np.ndarray] = None
+    filters: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    @classmethod
+    def from_frame(cls, conditions_df: pd.DataFrame) -> 'StrategyConditions':
+        cols = conditions_df.columns
+        return cls(
+            base_pattern_cond=conditions_df['base_pattern_cond'].to_numpy(),
+            is_bullish=conditions_df['is_bullish'].to_numpy(),
+            is_bearish=conditions_df['is_bearish'].to_numpy(),
+            entry_price=conditions_df['entry_price'].to_numpy(),
+            sl_price_long=conditions_df['sl_price_long'].to_numpy(),
+            sl_price_short=conditions_df['sl_price_short'].to_numpy(),
+            session_cond=conditions_df['session_cond'].to_numpy() if 'session_cond' in cols else None,
+            filters={col[len('filter_'):]: conditions_df[col].to_numpy()
+                     for col in cols if col.startswith('filter_')},
+        )
+
 
 class BaseStrategy(ABC):
     """
@@ -32,13 +127,28 @@ class BaseStrategy(ABC):
         """A list of names for the available filters the strategy provides."""
         pass
 
+    def required_columns(self) -> List[str]:
+        """
+        The unified-data columns this strategy reads in `generate_conditions`.
+
+        The default covers the OHLCV columns of STRATEGY_TIMEFRAME; strategies
+        that read additional columns should override and extend this list.
+        Callers use it to project a wide unified DataFrame down to the columns
+        a run actually touches before filtering and backtesting.
+        """
+        tf = self.STRATEGY_TIMEFRAME
+        return [f'{col}_{tf}' for col in ('open', 'high', 'low', 'close', 'volume')]
+
     @abstractmethod
     def generate_conditions(self, df: pd.DataFrame, strategy_params: Dict[str, Any] = {}) -> pd.DataFrame:
         """
         The core method to generate trading conditions and signals.
 
         Args:
-            df: A pandas DataFrame containing the market data.
+            df: A pandas DataFrame containing the market data. Implementations
+                must treat it as read-only (adding cache entries to `df.attrs`
+                is fine); callers rely on this to pass the frame without a
+                defensive copy.
             strategy_params: A dictionary of parameters to customize the strategy's behavior.
 
         Returns:
@@ -1,11 +1,11 @@
 # In Core/visualizer.py
 import pandas as pd
+import numpy as np
 import os
 import subprocess
 import sys
 from typing import Optional
 import plotly.graph_objects as go
-from plotly.subplots import make_subplots
 from typing import List, Optional
 
 def get_unique_filename(path: str) -> str:
@@ -36,6 +36,22 @@ def get_timeframe_padding(freq_str: Optional[str]) -> int:
     else: # 4H, D, etc.
         return 5
 
+def _nearest_candle_pos(ts: np.ndarray, when: pd.Timestamp) -> int:
+    """
+    Finds the position of the candle closest in time to `when` via binary search.
+
+    `ts` must be a sorted, tz-naive datetime64 array of NY candle times.
+    """
+    target = np.datetime64(when.tz_convert('America/New_York').tz_localize(None))
+    pos = int(np.searchsorted(ts, target))
+    if pos <= 0:
+        return 0
+    if pos >= len(ts):
+        return len(ts) - 1
+    # searchsorted gives the first candle at/after the target; the one before
+    # it may be closer.
+    return pos - 1 if (target - ts[pos - 1]) <= (ts[pos] - target) else pos
+
 def _smart_zoom_data(plot_df: pd.DataFrame, trades_df: pd.DataFrame) -> pd.DataFrame:
     """Crops the plotting data to focus on the area with trading activity."""
     if trades_df.empty:
@@ -48,8 +64,9 @@ def _smart_zoom_data(plot_df: pd.DataFrame, trades_df: pd.DataFrame) -> pd.DataF
     first_entry_time = trades_df['Entry Time'].min()
     last_exit_time = trades_df['Exit Time'].max()
 
-    first_trade_candle_idx = (plot_df['ny_time'] - first_entry_time).abs().idxmin()
-    last_trade_candle_idx = (plot_df['ny_time'] - last_exit_time).abs().idxmin()
+    ts = plot_df['ny_time'].dt.tz_localize(None).to_numpy()
+    first_trade_candle_idx = _nearest_candle_pos(ts, first_entry_time)
+    last_trade_candle_idx = _nearest_candle_pos(ts, last_exit_time)
 
     padding = get_timeframe_padding(freq_str)
     start_idx = max(0, first_trade_candle_idx - padding)
@@ -57,16 +74,15 @@ def _smart_zoom_data(plot_df: pd.DataFrame, trades_df: pd.DataFrame) -> pd.DataF
 
     return plot_df.iloc[start_idx:end_idx].copy()
 
-def _add_trade_markers(fig: go.Figure, trades_df: pd.DataFrame, plot_df: pd.DataFrame):
-    """Adds shapes and markers for each trade to the plot."""
-    # Remap original trade times to the new cropped dataframe's index
-    trades_df['entry_idx'] = trades_df['Entry Time'].apply(
-        lambda t: (plot_df['ny_time'] - t.tz_convert('America/New_York')).abs().idxmin()
-    )
-    trades_df['exit_idx'] = trades_df['Exit Time'].apply(
-        lambda t: (plot_df['ny_time'] - t.tz_convert('America/New_York')).abs().idxmin()
-    )
+def _build_trade_markers(trades_df: pd.DataFrame, plot_df: pd.DataFrame) -> tuple:
+    """Builds the trace and shape lists for each trade, without touching a Figure."""
+    # Remap original trade times to the new cropped dataframe's index; one
+    # binary search per trade instead of a full timedelta scan.
+    ts = plot_df['ny_time'].dt.tz_localize(None).to_numpy()
+    trades_df['entry_idx'] = [_nearest_candle_pos(ts, t) for t in trades_df['Entry Time']]
+    trades_df['exit_idx'] = [_nearest_candle_pos(ts, t) for t in trades_df['Exit Time']]
 
+    traces, shapes = [], []
     for _, trade in trades_df.iterrows():
         is_win, is_loss = trade['R-Multiple'] > 0, trade['R-Multiple'] < 0
         shape_fill = 'rgba(0, 255, 0, 0.2)' if is_win else ('rgba(255, 0, 0, 0.2)' if is_loss else 'rgba(128, 128, 128, 0.2)')
@@ -74,17 +90,18 @@ def _add_trade_markers(fig: go.Figure, trades_df: pd.DataFrame, plot_df: pd.Data
         entry_color = 'limegreen' if trade['Direction'] == 'LONG' else 'red'
         exit_color = 'deepskyblue' if trade.get('Exit Reason') == 'Take Profit' else 'orange'
 
-        fig.add_shape(type="rect", x0=trade['entry_idx'], y0=trade['Entry Price'], x1=trade['exit_idx'], y1=trade['Exit Price'],
-                      line=dict(color="rgba(0,0,0,0)"), fillcolor=shape_fill, layer='below')
-        fig.add_trace(go.Scatter(x=[trade['entry_idx']], y=[trade['Entry Price']], mode='markers',
+        shapes.append(dict(type="rect", x0=trade['entry_idx'], y0=trade['Entry Price'], x1=trade['exit_idx'], y1=trade['Exit Price'],
+                           line=dict(color="rgba(0,0,0,0)"), fillcolor=shape_fill, layer='below'))
+        traces.append(go.Scatter(x=[trade['entry_idx']], y=[trade['Entry Price']], mode='markers',
                                  marker=dict(symbol=entry_symbol, color=entry_color, size=15, line=dict(color='black', width=1)),
                                  name=f"Entry"))
-        fig.add_trace(go.Scatter(x=[trade['exit_idx']], y=[trade['Exit Price']], mode='markers',
+        traces.append(go.Scatter(x=[trade['exit_idx']], y=[trade['Exit Price']], mode='markers',
                                  marker=dict(symbol='star', color=exit_color, size=15, line=dict(color='black', width=1)),
                                  name=f"Exit"))
+    return traces, shapes
 
-def _configure_plot_layout(fig: go.Figure, plot_df: pd.DataFrame, asset_name: str, strategy_name: str, date_str: str):
-    """Configures the final layout, title, and axes for the plot."""
+def _build_plot_layout(plot_df: pd.DataFrame, shapes: list, asset_name: str, strategy_name: str, date_str: str) -> go.Layout:
+    """Builds the full layout (title, axes, trade shapes) for the plot."""
     tick_indices, tick_labels = [], []
     if not plot_df.empty:
         for i, row in plot_df.iterrows():
@@ -94,9 +111,10 @@ def _configure_plot_layout(fig: go.Figure, plot_df: pd.DataFrame, asset_name: st
 
     freq_str = pd.infer_freq(plot_df['ny_time']) if len(plot_df) > 1 else 'Unknown'
     chart_title = f"{asset_name} - {strategy_name} (Signal TF: {freq_str or 'Unknown'}) - {date_str}"
-    fig.update_layout(title=chart_title, xaxis_title='Time (NY)', yaxis_title='Price',
-                      xaxis_rangeslider_visible=False, showlegend=False, template="plotly_dark")
-    fig.update_xaxes(tickmode='array', tickvals=tick_indices, ticktext=tick_labels)
+    return go.Layout(title=chart_title, showlegend=False, template="plotly_dark", shapes=shapes,
+                     xaxis=dict(title='Time (NY)', rangeslider=dict(visible=False),
+                                tickmode='array', tickvals=tick_indices, ticktext=tick_labels),
+                     yaxis=dict(title='Price'))
 
 def plot_day_summary(plot_df: pd.DataFrame, trades_df: pd.DataFrame, asset_name: str, strategy_name: str, date_str: str) -> Optional[str]:
     """
@@ -122,19 +140,22 @@ def plot_day_summary(plot_df: pd.DataFrame, trades_df: pd.DataFrame, asset_name:
     plot_df = _smart_zoom_data(plot_df.reset_index(drop=True), trades_df)
     plot_df.reset_index(drop=True, inplace=True)
     
-    fig = make_subplots(rows=1, cols=1)
-
-    fig.add_trace(go.Candlestick(
+    # Assemble all traces, shapes and the layout first, then build the Figure
+    # in one call: each add_trace/add_shape would re-validate the whole figure.
+    traces = [go.Candlestick(
         x=plot_df.index, open=plot_df['open'], high=plot_df['high'], low=plot_df['low'], close=plot_df['close'],
         name='Price',
         increasing=dict(line=dict(color='deepskyblue'), fillcolor='deepskyblue'),
         decreasing=dict(line=dict(color='grey'), fillcolor='grey')
-    ))
+    )]
 
+    shapes = []
     if not trades_df.empty:
-        _add_trade_markers(fig, trades_df, plot_df)
+        trade_traces, shapes = _build_trade_markers(trades_df, plot_df)
+        traces.extend(trade_traces)
 
-    _configure_plot_layout(fig, plot_df, asset_name, strategy_name, date_str)
+    layout = _build_plot_layout(plot_df, shapes, asset_name, strategy_name, date_str)
+    fig = go.Figure(data=traces, layout=layout)
     
     results_folder = os.path.join(os.path.dirname(os.path.dirname(__file__)), "Results", "Charts")
     os.makedirs(results_folder, exist_ok=True)
@@ -143,7 +164,10 @@ def plot_day_summary(plot_df: pd.DataFrame, trades_df: pd.DataFrame, asset_name:
     
     save_path = get_unique_filename(initial_path)
     print(f"Generating chart: {save_path}")
-    fig.write_html(save_path)
+    # Load plotly.js from the CDN instead of embedding the ~3.5 MB bundle in
+    # every chart file; validate=False skips a second validation pass over
+    # traces we built ourselves.
+    fig.write_html(save_path, include_plotlyjs='cdn', validate=False)
     print("Chart saved successfully.")
     return save_path
 
@@ -154,6 +178,8 @@ def open_file(filepath: str):
             os.startfile(os.path.normpath(filepath))
         else:
             opener = "open" if sys.platform == "darwin" else "xdg-open"
-            subprocess.call([opener, filepath])
+            # Fire-and-forget: don't block the caller until the viewer exits.
+            subprocess.Popen([opener, filepath], stdout=subprocess.DEVNULL,
+                             stderr=subprocess.DEVNULL, start_new_session=True)
     except Exception as e:
         print(f"Error opening file: {e}")
\ No newline at end of file
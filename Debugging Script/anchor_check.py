@@ -0,0 +1,47 @@
+# In anchor_check.py
+# Shared resample-and-compare helpers for the data detective / file inspector
+# scripts, so each anchor candle is checked in one vectorized pass instead of
+# a per-anchor .loc lookup with field-by-field math.isclose.
+import numpy as np
+import pandas as pd
+
+OHLC_COLS = ['open', 'high', 'low', 'close']
+
+def resample_to_candles(raw_data: pd.DataFrame, freq: str = '1min') -> pd.DataFrame:
+    """Resamples raw tick data to clean candles indexed by NY time."""
+    aggregation_rules = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last'}
+    candle_data = raw_data.resample(freq).agg(aggregation_rules)
+    candle_data.dropna(inplace=True)
+    candle_data['ny_time'] = candle_data.index.tz_convert('America/New_York')
+    candle_data.set_index('ny_time', inplace=True)
+    return candle_data
+
+def check_anchor_candles(candle_data: pd.DataFrame, anchors: list):
+    """
+    Compares every anchor candle against the resampled data at once.
+
+    A reindex on the anchor timestamps aligns all candles in a single lookup;
+    np.isclose over the stacked OHLC arrays yields one match flag per anchor,
+    and NaN rows (which never compare close) mark anchors with no candle.
+    """
+    anchor_times = pd.DatetimeIndex(
+        pd.to_datetime([a['time'] for a in anchors])).tz_localize('America/New_York')
+    anchor_ohlc = np.array([[a[col] for col in OHLC_COLS] for a in anchors])
+
+    aligned = candle_data[OHLC_COLS].reindex(anchor_times)
+    aligned_ohlc = aligned.to_numpy()
+    found = ~np.isnan(aligned_ohlc[:, 0])
+    matches = np.isclose(aligned_ohlc, anchor_ohlc).all(axis=1)
+
+    for anchor, is_found, is_match, file_values in zip(anchors, found, matches, aligned_ohlc):
+        print(f"\nSearching for candle at NY Time: {anchor['time']}...")
+        if not is_found:
+            print(f"    VERDICT: CANDLE NOT FOUND! The candle at {anchor['time']} does not exist in the loaded data.")
+            continue
+        print(">>> CANDLE FOUND! <<<")
+        print(f"    Data from file: O={file_values[0]}, H={file_values[1]}, L={file_values[2]}, C={file_values[3]}")
+        print(f"    Your evidence:  O={anchor['open']}, H={anchor['high']}, L={anchor['low']}, C={anchor['close']}")
+        if is_match:
+            print("    VERDICT: PERFECT MATCH! The data exists and is correct.")
+        else:
+            print("    VERDICT: MISMATCH! The candle exists, but OHLC values are different.")
@@ -1,7 +1,7 @@
 # In data_detective.py
 import pandas as pd
-import math
 from data_handler import load_asset_data
+from anchor_check import resample_to_candles, check_anchor_candles
 
 # --- The "Ground Truth" Evidence You Provided ---
 ANCHOR_CANDLES = [
@@ -36,40 +36,10 @@ if __name__ == "__main__":
     else:
         print(f"Successfully loaded {len(raw_data):,} raw tick data.")
 
-        # 2. Resample to 1-minute candles
-        aggregation_rules = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last'}
-        candle_data = raw_data.resample('1min').agg(aggregation_rules)
-        candle_data.dropna(inplace=True)
+        # 2. Resample to 1-minute candles indexed by NY time
+        candle_data = resample_to_candles(raw_data, '1min')
         print(f"Resampled to {len(candle_data):,} clean 1-minute candles.")
-
-        # 3. Convert to NY Time for searching
-        candle_data['ny_time'] = candle_data.index.tz_convert('America/New_York')
-        candle_data.set_index('ny_time', inplace=True)
         print("Converted index to NY Time for searching.")
 
-        # 4. Search for each anchor candle
-        for anchor in ANCHOR_CANDLES:
-            timestamp_str = anchor["time"]
-            print(f"\nSearching for candle at NY Time: {timestamp_str}...")
-            
-            try:
-                # Use .loc to find the exact candle by its timestamp
-                found_candle = candle_data.loc[timestamp_str]
-                
-                print(">>> CANDLE FOUND! <<<")
-                print(f"    Data from file: O={found_candle.open}, H={found_candle.high}, L={found_candle.low}, C={found_candle.close}")
-                print(f"    Your evidence:  O={anchor['open']}, H={anchor['high']}, L={anchor['low']}, C={anchor['close']}")
-
-                # 5. Compare the data
-                is_match = (math.isclose(found_candle.open, anchor['open']) and
-                            math.isclose(found_candle.high, anchor['high']) and
-                            math.isclose(found_candle.low, anchor['low']) and
-                            math.isclose(found_candle.close, anchor['close']))
-
-                if is_match:
-                    print("    VERDICT: PERFECT MATCH! The data exists and is correct.")
-                else:
-                    print("    VERDICT: MISMATCH! The candle exists, but OHLC values are different.")
-
-            except KeyError:
-                print(f"    VERDICT: CANDLE NOT FOUND! The candle at {timestamp_str} does not exist in the loaded data.")
\ No newline at end of file
+        # 3. Search for and verify all anchor candles in one vectorized pass
+        check_anchor_candles(candle_data, ANCHOR_CANDLES)
\ No newline at end of file
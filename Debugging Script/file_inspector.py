@@ -1,7 +1,7 @@
 # In file_inspector.py
 import os
 import pandas as pd
-import math
+from anchor_check import resample_to_candles, check_anchor_candles
 
 # --- CONFIGURATION ---
 # List the exact filenames you want to inspect one by one.
@@ -35,8 +35,11 @@ if __name__ == "__main__":
             print("!!! FILE NOT FOUND at path:", full_path)
             continue
 
-        # 1. Load the single, raw file directly
-        raw_data = pd.read_parquet(full_path)
+        # 1. Load the single, raw file directly. Only the OHLC columns are
+        # inspected, so skip decoding anything else and let pyarrow use
+        # multiple threads.
+        raw_data = pd.read_parquet(full_path, columns=['open', 'high', 'low', 'close'],
+                                   engine='pyarrow', use_threads=True)
         print(f"Loaded {len(raw_data)} raw ticks from this file.")
 
         # 2. Inspect the raw timestamp range
@@ -54,29 +57,7 @@ if __name__ == "__main__":
         print(f"Max Timestamp (NY):  {max_ny_time}")
 
         # 3. Resample and search for anchor candles
-        aggregation_rules = {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last'}
-        candle_data = raw_data.resample('1min').agg(aggregation_rules)
-        candle_data.dropna(inplace=True)
-        candle_data['ny_time'] = candle_data.index.tz_convert('America/New_York')
-        candle_data.set_index('ny_time', inplace=True)
-        
-        print("\n--- Anchor Candle Search ---")
-        for anchor in ANCHOR_CANDLES:
-            timestamp_str = anchor["time"]
-            print(f"Searching for candle at NY Time: {timestamp_str}...")
-            
-            try:
-                found_candle = candle_data.loc[timestamp_str]
-                print(">>> CANDLE FOUND! <<<")
-                # Compare the data
-                is_match = (math.isclose(found_candle.open, anchor['open']) and
-                            math.isclose(found_candle.high, anchor['high']) and
-                            math.isclose(found_candle.low, anchor['low']) and
-                            math.isclose(found_candle.close, anchor['close']))
-                if is_match:
-                    print("    VERDICT: PERFECT MATCH! The candle is in this file.")
-                else:
-                    print("    VERDICT: MISMATCH! A candle exists at this time, but OHLC is different.")
+        candle_data = resample_to_candles(raw_data, '1min')
 
-            except KeyError:
-                print(f"    VERDICT: CANDLE NOT FOUND in this file.")
\ No newline at end of file
+        print("\n--- Anchor Candle Search ---")
+        check_anchor_candles(candle_data, ANCHOR_CANDLES)
\ No newline at end of file
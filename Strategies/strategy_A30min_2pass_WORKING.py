@@ -1,31 +1,184 @@
 # In Strategies/strategy_A30min.py
 import pandas as pd
 import numpy as np
+import heapq
 import os
 from datetime import time
+from numba import njit
+
+from Core.strategy_base import ny_seconds_of_day, resampled_view
 
 # --- STRATEGY METADATA ---
 STRATEGY_TIMEFRAME = '30min' # The timeframe for analysis and zone identification
 SESSION_TYPE = 'optional'
 AVAILABLE_FILTERS = []
 
-# --- HELPER FUNCTION FOR FVG DETECTION ---
-def find_fvg_near_index(df, origin_idx, fvg_type, tf_cols):
-    high_col, low_col = tf_cols['high'], tf_cols['low']
-    patterns_to_check = {
-        "Origin is C2": (origin_idx - 1, origin_idx, origin_idx + 1),
-        "Origin is C1": (origin_idx, origin_idx + 1, origin_idx + 2),
-        "After Origin is C1": (origin_idx + 1, origin_idx + 2, origin_idx + 3)
-    }
-    for check_name, (c1_idx, c2_idx, c3_idx) in patterns_to_check.items():
-        try:
-            if c1_idx < 0 or c3_idx >= len(df): continue
-            c1, c3 = df.iloc[c1_idx], df.iloc[c3_idx]
-            if (fvg_type == 'BEARISH' and c1[low_col] > c3[high_col]) or \
-               (fvg_type == 'BULLISH' and c1[high_col] < c3[low_col]):
-                return check_name, {'c1_idx': c1_idx, 'c2_idx': c2_idx, 'c3_idx': c3_idx}
-        except IndexError: continue
-    return None, None
+# --- NUMBA-COMPILED PHASE 1 SCAN ---
+# FVG placements relative to the origin candle: check k means the gap's C1
+# candle sits at origin_idx - 1 + k ("Origin is C2" / "Origin is C1" /
+# "After Origin is C1" in the original helper's terms).
+_FVG_ORIGIN_IS_C2, _FVG_ORIGIN_IS_C1 = 0, 1
+
+@njit(cache=True)
+def _find_fvg_near_index(high, low, origin_idx, bearish_fvg):
+    """Returns (check_id, c1_idx, c2_idx) of the first FVG near origin_idx, or (-1,-1,-1)."""
+    n = high.shape[0]
+    for check in range(3):
+        c1 = origin_idx - 1 + check
+        c3 = c1 + 2
+        if c1 < 0 or c3 >= n:
+            continue
+        if bearish_fvg:
+            if low[c1] > high[c3]:
+                return check, c1, c1 + 1
+        elif high[c1] < low[c3]:
+            return check, c1, c1 + 1
+    return -1, -1, -1
+
+@njit(cache=True)
+def _zone_bounds(high, low, check, c1, origin_idx, bearish_zone):
+    """
+    Computes (zone_low, zone_high) for a newly violated leg. The near edge
+    comes from the FVG's C1 candle (or the origin for check 1); the far edge
+    combines the extremes of C1, the origin, and the candle before the origin
+    where the placement uses them.
+    """
+    has_before = origin_idx > 0
+    if bearish_zone:
+        if check == _FVG_ORIGIN_IS_C2:
+            return low[c1], max(high[c1], high[origin_idx])
+        if check == _FVG_ORIGIN_IS_C1:
+            far = high[origin_idx]
+            if has_before and high[origin_idx - 1] > far: far = high[origin_idx - 1]
+            return low[origin_idx], far
+        far = max(high[c1], high[origin_idx])
+        if has_before and high[origin_idx - 1] > far: far = high[origin_idx - 1]
+        return low[c1], far
+    if check == _FVG_ORIGIN_IS_C2:
+        return min(low[c1], low[origin_idx]), high[c1]
+    if check == _FVG_ORIGIN_IS_C1:
+        far = low[origin_idx]
+        if has_before and low[origin_idx - 1] < far: far = low[origin_idx - 1]
+        return far, high[origin_idx]
+    far = min(low[c1], low[origin_idx])
+    if has_before and low[origin_idx - 1] < far: far = low[origin_idx - 1]
+    return far, high[c1]
+
+@njit(cache=True)
+def _find_zones(open_, high, low, close):
+    """
+    The Phase 1 market-structure state machine, compiled with Numba.
+
+    Tracks VL/VH anchors and confirmed swing points over the 30-min bars,
+    monitors the resulting legs, and on each leg violation looks for a nearby
+    unmitigated FVG. Returns parallel arrays (is_bearish, zone_low, zone_high,
+    created_at_bar) describing the trading zones, trimmed to the zone count.
+    """
+    n = open_.shape[0]
+    # Each monitored leg produces at most one zone, and each bar can add at
+    # most one leg of each direction, so 2n bounds every buffer below.
+    zone_is_bearish = np.empty(2 * n + 1, dtype=np.bool_)
+    zone_lows = np.empty(2 * n + 1, dtype=np.float64)
+    zone_highs = np.empty(2 * n + 1, dtype=np.float64)
+    zone_created = np.empty(2 * n + 1, dtype=np.int64)
+    n_zones = 0
+
+    # Legs to monitor, as parallel arrays with head counters. Bullish legs
+    # violate on close < leg_low; bearish legs on close > leg_high.
+    bull_low = np.empty(n + 1, dtype=np.float64)
+    bull_origin = np.empty(n + 1, dtype=np.int64)
+    bull_violated = np.empty(n + 1, dtype=np.bool_)
+    n_bull = 0
+    bear_high = np.empty(n + 1, dtype=np.float64)
+    bear_origin = np.empty(n + 1, dtype=np.int64)
+    bear_violated = np.empty(n + 1, dtype=np.bool_)
+    n_bear = 0
+
+    last_vl_price, has_last_vl = np.nan, False
+    last_vh_price, has_last_vh = np.nan, False
+    last_structure = 0  # 0 = none, 1 = VL, 2 = VH
+    anchorVL_trigger_high, activeLeg_low, activeLeg_low_idx = np.nan, np.nan, -1
+    anchorVH_trigger_low, activeLeg_high, activeLeg_high_idx = np.nan, np.nan, -1
+
+    for i in range(n):
+        row_open, row_high, row_low, row_close = open_[i], high[i], low[i], close[i]
+        if not np.isnan(anchorVL_trigger_high):
+            if np.isnan(activeLeg_low) or row_low < activeLeg_low:
+                activeLeg_low, activeLeg_low_idx = row_low, i
+        if not np.isnan(anchorVH_trigger_low):
+            if np.isnan(activeLeg_high) or row_high > activeLeg_high:
+                activeLeg_high, activeLeg_high_idx = row_high, i
+        is_bearish, is_bullish = row_close < row_open, row_close > row_open
+        if is_bearish and last_structure != 1:
+            if np.isnan(anchorVL_trigger_high):
+                anchorVL_trigger_high, activeLeg_low, activeLeg_low_idx = row_high, row_low, i
+            elif row_close < anchorVL_trigger_high:
+                anchorVL_trigger_high = row_high
+        if is_bullish and last_structure != 2:
+            if np.isnan(anchorVH_trigger_low):
+                anchorVH_trigger_low, activeLeg_high, activeLeg_high_idx = row_low, row_high, i
+            elif row_close > anchorVH_trigger_low:
+                anchorVH_trigger_low = row_low
+        new_vl_confirmed = (not np.isnan(anchorVL_trigger_high)) and row_close > anchorVL_trigger_high
+        new_vh_confirmed = (not np.isnan(anchorVH_trigger_low)) and row_close < anchorVH_trigger_low
+
+        if new_vl_confirmed:
+            if has_last_vh:
+                bear_high[n_bear] = last_vh_price
+                bear_origin[n_bear] = activeLeg_low_idx
+                bear_violated[n_bear] = False
+                n_bear += 1
+            last_vl_price, has_last_vl = activeLeg_low, True
+            last_structure = 1
+            anchorVL_trigger_high, activeLeg_low = np.nan, np.nan
+            anchorVH_trigger_low, activeLeg_high, activeLeg_high_idx = row_low, row_high, i
+        if new_vh_confirmed:
+            if has_last_vl:
+                bull_low[n_bull] = last_vl_price
+                bull_origin[n_bull] = activeLeg_high_idx
+                bull_violated[n_bull] = False
+                n_bull += 1
+            last_vh_price, has_last_vh = activeLeg_high, True
+            last_structure = 2
+            anchorVH_trigger_low, activeLeg_high = np.nan, np.nan
+            anchorVL_trigger_high, activeLeg_low, activeLeg_low_idx = row_high, row_low, i
+
+        for j in range(n_bull):
+            if not bull_violated[j] and row_close < bull_low[j]:
+                bull_violated[j] = True
+                check, c1, c2 = _find_fvg_near_index(high, low, bull_origin[j], True)
+                if check >= 0:
+                    z_lo, z_hi = _zone_bounds(high, low, check, c1, bull_origin[j], True)
+                    mitigated = False
+                    for k in range(c2 + 1, i):
+                        if high[k] >= z_lo:
+                            mitigated = True
+                            break
+                    if not mitigated:
+                        zone_is_bearish[n_zones] = True
+                        zone_lows[n_zones], zone_highs[n_zones] = z_lo, z_hi
+                        zone_created[n_zones] = i
+                        n_zones += 1
+
+        for j in range(n_bear):
+            if not bear_violated[j] and row_close > bear_high[j]:
+                bear_violated[j] = True
+                check, c1, c2 = _find_fvg_near_index(high, low, bear_origin[j], False)
+                if check >= 0:
+                    z_lo, z_hi = _zone_bounds(high, low, check, c1, bear_origin[j], False)
+                    mitigated = False
+                    for k in range(c2 + 1, i):
+                        if low[k] <= z_hi:
+                            mitigated = True
+                            break
+                    if not mitigated:
+                        zone_is_bearish[n_zones] = False
+                        zone_lows[n_zones], zone_highs[n_zones] = z_lo, z_hi
+                        zone_created[n_zones] = i
+                        n_zones += 1
+
+    return (zone_is_bearish[:n_zones], zone_lows[:n_zones],
+            zone_highs[:n_zones], zone_created[:n_zones])
 
 def generate_conditions(df: pd.DataFrame, strategy_params: dict = {}) -> pd.DataFrame:
     print(f"--- Running Strategy: 30m Order Block with FVG Refinement ---")
@@ -39,109 +192,80 @@ def generate_conditions(df: pd.DataFrame, strategy_params: dict = {}) -> pd.Data
     # ===============================================================================================
     tf = STRATEGY_TIMEFRAME
     open_col, high_col, low_col, close_col = f'open_{tf}', f'high_{tf}', f'low_{tf}', f'close_{tf}'
-    tf_cols = {'open': open_col, 'high': high_col, 'low': low_col, 'close': close_col}
-    
-    is_new_candle_start = df[open_col].ne(df[open_col].shift(1))
-    df_30min = df[is_new_candle_start].copy()
-
-    active_trading_zones = [] 
-    
-    bullish_legs_to_monitor, bearish_legs_to_monitor = [], []
-    last_confirmed_vh, last_confirmed_vl = None, None
-    g_lastStructureType = None
-    anchorVL_trigger_high, activeLeg_low, activeLeg_low_idx = np.nan, np.nan, -1
-    anchorVH_trigger_low, activeLeg_high, activeLeg_high_idx = np.nan, np.nan, -1
 
-    for i, row in enumerate(df_30min.itertuples(name='Candle')):
-        row_close = getattr(row, close_col)
-        if not np.isnan(anchorVL_trigger_high):
-            if np.isnan(activeLeg_low) or getattr(row, low_col) < activeLeg_low: activeLeg_low, activeLeg_low_idx = getattr(row, low_col), i
-        if not np.isnan(anchorVH_trigger_low):
-            if np.isnan(activeLeg_high) or getattr(row, high_col) > activeLeg_high: activeLeg_high, activeLeg_high_idx = getattr(row, high_col), i
-        is_bearish, is_bullish = row_close < getattr(row, open_col), row_close > getattr(row, open_col)
-        if is_bearish and g_lastStructureType != 'VL':
-            if np.isnan(anchorVL_trigger_high): anchorVL_trigger_high, activeLeg_low, activeLeg_low_idx = getattr(row, high_col), getattr(row, low_col), i
-            elif row_close < anchorVL_trigger_high: anchorVL_trigger_high = getattr(row, high_col)
-        if is_bullish and g_lastStructureType != 'VH':
-            if np.isnan(anchorVH_trigger_low): anchorVH_trigger_low, activeLeg_high, activeLeg_high_idx = getattr(row, low_col), getattr(row, high_col), i
-            elif row_close > anchorVH_trigger_low: anchorVH_trigger_low = getattr(row, low_col)
-        new_vl_confirmed = not np.isnan(anchorVL_trigger_high) and row_close > anchorVL_trigger_high
-        new_vh_confirmed = not np.isnan(anchorVH_trigger_low) and row_close < anchorVH_trigger_low
+    df_30min = resampled_view(df, tf)
 
-        if new_vl_confirmed:
-            new_point = {'price': activeLeg_low, 'idx': activeLeg_low_idx, 'time': row.Index}
-            if last_confirmed_vh: bearish_legs_to_monitor.append({'leg_high': last_confirmed_vh['price'], 'leg_low': new_point['price'], 'origin_candle_idx': new_point['idx'], 'is_violated': False})
-            last_confirmed_vl = new_point; g_lastStructureType = 'VL'; anchorVL_trigger_high, activeLeg_low = np.nan, np.nan; anchorVH_trigger_low, activeLeg_high, activeLeg_high_idx = getattr(row, low_col), getattr(row, high_col), i
-        if new_vh_confirmed:
-            new_point = {'price': activeLeg_high, 'idx': activeLeg_high_idx, 'time': row.Index}
-            if last_confirmed_vl: bullish_legs_to_monitor.append({'leg_low': last_confirmed_vl['price'], 'leg_high': new_point['price'], 'origin_candle_idx': new_point['idx'], 'is_violated': False})
-            last_confirmed_vh = new_point; g_lastStructureType = 'VH'; anchorVH_trigger_low, activeLeg_high = np.nan, np.nan; anchorVL_trigger_high, activeLeg_low, activeLeg_low_idx = getattr(row, high_col), getattr(row, low_col), i
-
-        for leg in bullish_legs_to_monitor:
-            if not leg['is_violated'] and row_close < leg['leg_low']:
-                leg['is_violated'] = True
-                check_name, fvg_indices = find_fvg_near_index(df_30min, leg['origin_candle_idx'], 'BEARISH', tf_cols)
-                if fvg_indices:
-                    origin_candle = df_30min.iloc[leg['origin_candle_idx']]; fvg_c1 = df_30min.iloc[fvg_indices['c1_idx']]
-                    if check_name == "Origin is C2": zone_low = fvg_c1[low_col]; zone_high = max(fvg_c1[high_col], origin_candle[high_col])
-                    elif check_name == "Origin is C1": zone_low = origin_candle[low_col]; candle_before = df_30min.iloc[leg['origin_candle_idx']-1] if leg['origin_candle_idx'] > 0 else None; zone_high = max(origin_candle[high_col], candle_before[high_col]) if candle_before is not None else origin_candle[high_col]
-                    else: zone_low = fvg_c1[low_col]; candle_before = df_30min.iloc[leg['origin_candle_idx']-1] if leg['origin_candle_idx'] > 0 else None; zone_high = max(fvg_c1[high_col], origin_candle[high_col], candle_before[high_col]) if candle_before is not None else max(fvg_c1[high_col], origin_candle[high_col])
-                    mitigation_df = df_30min.iloc[fvg_indices['c2_idx'] + 1 : i]
-                    if mitigation_df.empty or not (mitigation_df[high_col] >= zone_low).any():
-                        active_trading_zones.append({'type': 'BEARISH', 'zone_low': zone_low, 'zone_high': zone_high, 'created_at': row.Index})
-
-        for leg in bearish_legs_to_monitor:
-            if not leg['is_violated'] and row_close > leg['leg_high']:
-                leg['is_violated'] = True
-                check_name, fvg_indices = find_fvg_near_index(df_30min, leg['origin_candle_idx'], 'BULLISH', tf_cols)
-                if fvg_indices:
-                    origin_candle = df_30min.iloc[leg['origin_candle_idx']]; fvg_c1 = df_30min.iloc[fvg_indices['c1_idx']]
-                    if check_name == "Origin is C2": zone_high = fvg_c1[high_col]; zone_low = min(fvg_c1[low_col], origin_candle[low_col])
-                    elif check_name == "Origin is C1": zone_high = origin_candle[high_col]; candle_before = df_30min.iloc[leg['origin_candle_idx'] - 1] if leg['origin_candle_idx'] > 0 else None; zone_low = min(origin_candle[low_col], candle_before[low_col]) if candle_before is not None else origin_candle[low_col]
-                    else: zone_high = fvg_c1[high_col]; candle_before = df_30min.iloc[leg['origin_candle_idx']-1] if leg['origin_candle_idx'] > 0 else None; zone_low = min(fvg_c1[low_col], origin_candle[low_col], candle_before[low_col]) if candle_before is not None else min(fvg_c1[low_col], origin_candle[low_col])
-                    mitigation_df = df_30min.iloc[fvg_indices['c2_idx'] + 1 : i]
-                    if mitigation_df.empty or not (mitigation_df[low_col] <= zone_high).any():
-                        active_trading_zones.append({'type': 'BULLISH', 'zone_low': zone_low, 'zone_high': zone_high, 'created_at': row.Index})
-
-    print(f"Phase 1 complete. Identified {len(active_trading_zones)} potential trading zones.")
+    # Materialize the 30-min OHLC once as contiguous float64 columns and hand
+    # the stateful scan to the compiled _find_zones kernel.
+    ohlc_30min = df_30min[[open_col, high_col, low_col, close_col]].to_numpy(dtype=np.float64)
+    times_30min = df_30min.index
+
+    # The zones stay in the kernel's struct-of-arrays layout all the way
+    # through Phase 2 — no list-of-dicts materialization in between.
+    zone_is_bearish, zone_lows, zone_highs, zone_created = _find_zones(
+        np.ascontiguousarray(ohlc_30min[:, 0]), np.ascontiguousarray(ohlc_30min[:, 1]),
+        np.ascontiguousarray(ohlc_30min[:, 2]), np.ascontiguousarray(ohlc_30min[:, 3]))
+    n_zones = len(zone_lows)
+
+    print(f"Phase 1 complete. Identified {n_zones} potential trading zones.")
 
     # ===============================================================================================
     # PHASE 2: GENERATE TRADING SIGNALS
     # ===============================================================================================
-    conditions_df = pd.DataFrame(index=df.index)
-    conditions_df['base_pattern_cond'] = False
-    conditions_df['is_bullish'] = False
-    conditions_df['is_bearish'] = False
-    conditions_df['entry_price'] = np.nan
-    conditions_df['sl_price_long'] = np.nan
-    conditions_df['sl_price_short'] = np.nan
-    
-    exec_high_col, exec_low_col = f'high_30s', f'low_30s'
-
-    for row in df.itertuples():
-        if not active_trading_zones: continue 
-        for zone in list(active_trading_zones):
-            # --- THIS IS THE FIX (Part 2): Ensure we don't trade a zone on the same 30min bar it was created ---
-            if row.Index <= zone['created_at']:
-                continue
-
-            if zone['type'] == 'BEARISH' and getattr(row, exec_high_col) >= zone['zone_low']:
-                conditions_df.at[row.Index, 'base_pattern_cond'] = True
-                conditions_df.at[row.Index, 'is_bearish'] = True
-                conditions_df.at[row.Index, 'entry_price'] = zone['zone_low']
-                conditions_df.at[row.Index, 'sl_price_short'] = zone['zone_high']
-                active_trading_zones.remove(zone) 
-                break 
-            
-            elif zone['type'] == 'BULLISH' and getattr(row, exec_low_col) <= zone['zone_high']:
-                conditions_df.at[row.Index, 'base_pattern_cond'] = True
-                conditions_df.at[row.Index, 'is_bullish'] = True
-                conditions_df.at[row.Index, 'entry_price'] = zone['zone_high']
-                conditions_df.at[row.Index, 'sl_price_long'] = zone['zone_low']
-                active_trading_zones.remove(zone)
-                break
-                
-    print(f"Phase 2 complete. Generated {conditions_df['base_pattern_cond'].sum()} trade signals.")
+    # Preallocate plain typed arrays; signal hits are scattered into them and
+    # the DataFrame is assembled once at the end — no per-tick .at writes.
+    n = len(df)
+    base_pattern_cond = np.zeros(n, dtype=bool)
+    is_bullish_sig = np.zeros(n, dtype=bool)
+    is_bearish_sig = np.zeros(n, dtype=bool)
+    entry_price = np.full(n, np.nan)
+    sl_price_long = np.full(n, np.nan)
+    sl_price_short = np.full(n, np.nan)
+
+    exec_high = df['high_30s'].to_numpy()
+    exec_low = df['low_30s'].to_numpy()
+    tick_index = df.index
+
+    def _first_hit(z, start):
+        """Position of the first tick at/after `start` that touches zone z, or -1."""
+        if zone_is_bearish[z]:
+            hits = exec_high[start:] >= zone_lows[z]
+        else:
+            hits = exec_low[start:] <= zone_highs[z]
+        pos = int(hits.argmax()) if hits.size else 0
+        return start + pos if hits.size and hits[pos] else -1
+
+    # One vectorized first-hit search per zone instead of a Python scan over
+    # every tick. A heap ordered by (tick, creation order) replays the old
+    # loop's semantics: each tick consumes at most one zone — the earliest
+    # created wins — and a zone beaten to a tick re-searches from the next one.
+    zone_start = tick_index.searchsorted(times_30min[zone_created], side='right') if n_zones else []
+    heap = []
+    for z in range(n_zones):
+        t = _first_hit(z, int(zone_start[z]))
+        if t >= 0:
+            heapq.heappush(heap, (t, z))
+
+    tick_taken = np.zeros(n, dtype=bool)
+    while heap:
+        t, z = heapq.heappop(heap)
+        if tick_taken[t]:
+            t = _first_hit(z, t + 1)
+            if t >= 0:
+                heapq.heappush(heap, (t, z))
+            continue
+        tick_taken[t] = True
+        base_pattern_cond[t] = True
+        if zone_is_bearish[z]:
+            is_bearish_sig[t] = True
+            entry_price[t] = zone_lows[z]
+            sl_price_short[t] = zone_highs[z]
+        else:
+            is_bullish_sig[t] = True
+            entry_price[t] = zone_highs[z]
+            sl_price_long[t] = zone_lows[z]
+
+    print(f"Phase 2 complete. Generated {base_pattern_cond.sum()} trade signals.")
 
     # --- Session Condition ---
     session_start_str = strategy_params.get('session_start_str')
@@ -151,16 +275,30 @@ def generate_conditions(df: pd.DataFrame, strategy_params: dict = {}) -> pd.Data
         start_time = time.fromisoformat(session_start_str)
         end_time = time.fromisoformat(session_end_str)
 
-        df_ny_time = df['ny_time'].dt.time
+        # Compare integer seconds-of-day instead of .dt.time, which would
+        # allocate a Python datetime.time object for every row.
+        seconds_of_day = ny_seconds_of_day(df)
+        start_s = start_time.hour * 3600 + start_time.minute * 60 + start_time.second
+        end_s = end_time.hour * 3600 + end_time.minute * 60 + end_time.second
 
         if start_time > end_time: # Overnight session
-            conditions_df['session_cond'] = (df_ny_time >= start_time) | (df_ny_time <= end_time)
+            session_cond = (seconds_of_day >= start_s) | (seconds_of_day <= end_s)
         else:
-            conditions_df['session_cond'] = (df_ny_time >= start_time) & (df_ny_time <= end_time)
+            session_cond = (seconds_of_day >= start_s) & (seconds_of_day <= end_s)
 
         print(f"Applied session filter: {start_time.strftime('%H:%M:%S')} - {end_time.strftime('%H:%M:%S')}")
     else:
-        conditions_df['session_cond'] = True
+        session_cond = np.ones(n, dtype=bool)
         print("No session filter applied, running on all data.")
 
-    return conditions_df
\ No newline at end of file
+    # One-shot construction from pre-typed arrays: appending session_cond to
+    # an existing frame would split and re-consolidate the boolean block.
+    return pd.DataFrame({
+        'base_pattern_cond': base_pattern_cond,
+        'is_bullish': is_bullish_sig,
+        'is_bearish': is_bearish_sig,
+        'entry_price': entry_price,
+        'sl_price_long': sl_price_long,
+        'sl_price_short': sl_price_short,
+        'session_cond': session_cond,
+    }, index=df.index)
\ No newline at end of file
@@ -5,7 +5,7 @@ from datetime import time
 from typing import List, Dict, Any
 
 # Add an import for the new base class
-from Core.strategy_base import BaseStrategy
+from Core.strategy_base import BaseStrategy, ny_seconds_of_day, resampled_view
 
 class StrategyPR(BaseStrategy):
     """
@@ -34,72 +34,97 @@ class StrategyPR(BaseStrategy):
         tf = self.STRATEGY_TIMEFRAME
         open_col, high_col, low_col, close_col, volume_col = f'open_{tf}', f'high_{tf}', f'low_{tf}', f'close_{tf}', f'volume_{tf}'
         
-        is_new_candle_start = df[open_col].ne(df[open_col].shift(1))
-        df_15min = df[is_new_candle_start].copy()
+        df_15min = resampled_view(df, tf)
+
+        # All conditions compare the signal candle (shift 1) against the one
+        # before it (shift 2). Work on the raw arrays with offset slices
+        # instead of seven .shift() Series and two concat-based reductions:
+        # same values, but everything stays in a handful of NumPy passes.
+        o = df_15min[open_col].to_numpy()
+        h = df_15min[high_col].to_numpy()
+        l = df_15min[low_col].to_numpy()
+        c = df_15min[close_col].to_numpy()
+        v = df_15min[volume_col].to_numpy()
+        n = len(df_15min)
 
         # Base Pattern Condition
-        pattern_cond = (df_15min[high_col].shift(1) >= df_15min[high_col].shift(2)) & \
-                       (df_15min[low_col].shift(1) <= df_15min[low_col].shift(2))
+        pattern_cond = np.zeros(n, dtype=bool)
+        pattern_cond[2:] = (h[1:-1] >= h[:-2]) & (l[1:-1] <= l[:-2])
 
         # Filter: Volume Condition
-        volume_cond = df_15min[volume_col].shift(1) > df_15min[volume_col].shift(2)
+        volume_cond = np.zeros(n, dtype=bool)
+        volume_cond[2:] = v[1:-1] > v[:-2]
 
-        # Filter: Body Condition
-        signal_close = df_15min[close_col].shift(1)
-        prev_open = df_15min[open_col].shift(2)
-        prev_close = df_15min[close_col].shift(2)
-        prev_body_top = pd.concat([prev_open, prev_close], axis=1).max(axis=1)
-        prev_body_bottom = pd.concat([prev_open, prev_close], axis=1).min(axis=1)
-        body_cond = ~((signal_close < prev_body_top) & (signal_close > prev_body_bottom))
+        # Filter: Body Condition (NaN comparisons made the first two rows
+        # True under the shift-based version; keep that)
+        prev_body_top = np.maximum(o[:-2], c[:-2]) if n >= 2 else o[:0]
+        prev_body_bottom = np.minimum(o[:-2], c[:-2]) if n >= 2 else o[:0]
+        signal_close = c[1:-1] if n >= 2 else c[:0]
+        body_cond = np.ones(n, dtype=bool)
+        body_cond[2:] = ~((signal_close < prev_body_top) & (signal_close > prev_body_bottom))
 
         # Directional Information
-        signal_open = df_15min[open_col].shift(1)
-        is_bullish = signal_close > signal_open
-        is_bearish = signal_close < signal_open
-
-        # --- ASSEMBLE THE RESULTS DATAFRAME ---
-        conditions_df = pd.DataFrame(index=df_15min.index)
-
-        conditions_df['base_pattern_cond'] = pattern_cond
-        conditions_df['filter_Volume'] = volume_cond
-        conditions_df['filter_Body'] = body_cond
-
-        conditions_df['is_bullish'] = is_bullish
-        conditions_df['is_bearish'] = is_bearish
-        conditions_df['entry_price'] = df_15min[open_col]
-        conditions_df['sl_price_long'] = df_15min[low_col].shift(1)
-        conditions_df['sl_price_short'] = df_15min[high_col].shift(1)
+        is_bullish = np.zeros(n, dtype=bool)
+        is_bearish = np.zeros(n, dtype=bool)
+        if n >= 1:
+            is_bullish[1:] = c[:-1] > o[:-1]
+            is_bearish[1:] = c[:-1] < o[:-1]
+
+        sl_price_long = np.full(n, np.nan)
+        sl_price_short = np.full(n, np.nan)
+        if n >= 1:
+            sl_price_long[1:] = l[:-1]
+            sl_price_short[1:] = h[:-1]
 
         # --- Session Condition ---
         session_start_str = strategy_params.get('session_start_str')
         session_end_str = strategy_params.get('session_end_str')
 
-        if 'ny_time' not in df_15min.columns:
-            df_15min['ny_time'] = df_15min.index.tz_convert('America/New_York')
-
+        positions = df.attrs[f'_candle_pos_{tf}']
         if session_start_str and session_end_str:
             start_time = time.fromisoformat(session_start_str)
             end_time = time.fromisoformat(session_end_str)
 
-            df_15min_ny_time = df_15min['ny_time'].dt.time
-
-            if start_time > end_time: # Overnight session
-                session_mask = (df_15min_ny_time >= start_time) | (df_15min_ny_time <= end_time)
-            else:
-                session_mask = (df_15min_ny_time >= start_time) & (df_15min_ny_time <= end_time)
+            # Integer seconds-of-day comparisons on the cached NY clock array
+            # instead of allocating a datetime.time object per candle. The
+            # resulting mask is cached too, so parameter sweeps that reuse
+            # the same session bounds skip the comparison entirely.
+            start_s = start_time.hour * 3600 + start_time.minute * 60 + start_time.second
+            end_s = end_time.hour * 3600 + end_time.minute * 60 + end_time.second
+            mask_key = f'_session_mask_{tf}_{start_s}_{end_s}'
+            session_cond = df.attrs.get(mask_key)
+            if session_cond is None:
+                sod_15min = ny_seconds_of_day(df)[positions]
+                if start_time > end_time: # Overnight session
+                    session_cond = (sod_15min >= start_s) | (sod_15min <= end_s)
+                else:
+                    session_cond = (sod_15min >= start_s) & (sod_15min <= end_s)
+                df.attrs[mask_key] = session_cond
 
-            conditions_df['session_cond'] = session_mask
             print(f"Applied session filter: {start_time.strftime('%H:%M:%S')} - {end_time.strftime('%H:%M:%S')}")
         else:
-            conditions_df['session_cond'] = True
+            session_cond = np.ones(n, dtype=bool)
             print("No session filter applied, running on all data.")
 
-        final_df = conditions_df.reindex(df.index, method='ffill')
-
-        # Ensure boolean columns are filled with False, not True, after ffill
-        bool_cols = ['base_pattern_cond', 'filter_Volume', 'filter_Body', 'is_bullish', 'is_bearish', 'session_cond']
-        for col in bool_cols:
-            if col in final_df.columns:
-                final_df[col] = final_df[col].fillna(False)
+        # --- ASSEMBLE THE RESULTS DATAFRAME ---
+        # Each candle's values hold for every tick until the next candle, so
+        # replicate them with np.repeat over the cached candle-start run
+        # lengths instead of a reindex(method='ffill') merge over the full
+        # tick index. All defaults are baked in above, so no fillna pass.
+        run_lengths = np.diff(np.r_[positions, len(df)])
+        candle_values = {
+            'base_pattern_cond': pattern_cond,
+            'filter_Volume': volume_cond,
+            'filter_Body': body_cond,
+            'is_bullish': is_bullish,
+            'is_bearish': is_bearish,
+            'entry_price': o,
+            'sl_price_long': sl_price_long,
+            'sl_price_short': sl_price_short,
+            'session_cond': session_cond,
+        }
+        final_df = pd.DataFrame(
+            {name: np.repeat(values, run_lengths) for name, values in candle_values.items()},
+            index=df.index)
 
         return final_df
\ No newline at end of file
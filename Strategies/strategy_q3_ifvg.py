@@ -3,8 +3,124 @@ import pandas as pd
 import numpy as np
 from datetime import time
 from typing import List, Dict, Any
+from numba import njit
+
+from Core.strategy_base import BaseStrategy, empty_conditions_df, ny_seconds_of_day, resampled_view
+
+
+@njit(cache=True)
+def _scan_killzones(o, h, l, c, secs, day_key,
+                    kz1_start, kz1_end, tz1_check, tz1_start, tz1_end,
+                    kz2_start, kz2_end, tz2_check, tz2_start, tz2_end):
+    """
+    The sequential killzone/sweep/iFVG state machine, compiled with Numba.
+
+    Works on plain arrays: OHLC per candle, integer seconds-of-day and a
+    yyyymmdd day key. Returns (candle positions, is_bullish flags, entry
+    prices, stop prices) for every signal, trimmed to the signal count.
+    """
+    n = o.shape[0]
+    sig_idx = np.empty(2 * n + 1, dtype=np.int64)
+    sig_is_bull = np.empty(2 * n + 1, dtype=np.bool_)
+    sig_entry = np.empty(2 * n + 1, dtype=np.float64)
+    sig_sl = np.empty(2 * n + 1, dtype=np.float64)
+    n_sig = 0
+
+    current_day = np.int64(-1)
+    kz1_high, kz1_low, kz2_high, kz2_low = np.nan, np.nan, np.nan, np.nan
+    kz1_long_setup_valid, kz1_short_setup_valid = True, True
+    kz1_low_sweep, kz1_high_sweep = False, False
+    kz2_long_setup_valid, kz2_short_setup_valid = True, True
+    kz2_low_sweep, kz2_high_sweep = False, False
+    # FVGs are tracked by the start candle's position; -1 means none active.
+    # The stop level for each active FVG is a running extreme maintained in
+    # O(1) per candle instead of a slice reduction at signal time.
+    bull_fvg_bottom, bull_fvg_start, bull_fvg_sl = np.nan, -1, np.nan
+    bear_fvg_top, bear_fvg_start, bear_fvg_sl = np.nan, -1, np.nan
+
+    for i in range(n):
+        current_time = secs[i]
+        if day_key[i] != current_day:
+            current_day = day_key[i]
+            kz1_high, kz1_low, kz2_high, kz2_low = np.nan, np.nan, np.nan, np.nan
+            kz1_long_setup_valid, kz1_short_setup_valid = True, True
+            kz1_low_sweep, kz1_high_sweep = False, False
+            kz2_long_setup_valid, kz2_short_setup_valid = True, True
+            kz2_low_sweep, kz2_high_sweep = False, False
+            bull_fvg_bottom, bull_fvg_start, bull_fvg_sl = np.nan, -1, np.nan
+            bear_fvg_top, bear_fvg_start, bear_fvg_sl = np.nan, -1, np.nan
+
+        row_high, row_low, row_open, row_close = h[i], l[i], o[i], c[i]
+
+        if bull_fvg_start >= 0 and row_high > bull_fvg_sl: bull_fvg_sl = row_high
+        if bear_fvg_start >= 0 and row_low < bear_fvg_sl: bear_fvg_sl = row_low
+
+        if i >= 2:
+            if row_low > h[i - 2]:
+                bull_fvg_bottom, bull_fvg_start = h[i - 2], i - 2
+                bull_fvg_sl = max(h[i - 2], h[i - 1], row_high)
+            if row_high < l[i - 2]:
+                bear_fvg_top, bear_fvg_start = l[i - 2], i - 2
+                bear_fvg_sl = min(l[i - 2], l[i - 1], row_low)
+
+        if kz1_start <= current_time <= kz1_end:
+            kz1_high = max(kz1_high, row_high) if not np.isnan(kz1_high) else row_high
+            kz1_low = min(kz1_low, row_low) if not np.isnan(kz1_low) else row_low
+
+        if current_time == tz1_check and not np.isnan(kz1_high):
+            if row_open > kz1_high: kz1_short_setup_valid = False
+            if row_open < kz1_low:  kz1_long_setup_valid = False
+
+        if tz1_start <= current_time <= tz1_end and not np.isnan(kz1_high):
+            if not kz1_high_sweep and row_high > kz1_high: kz1_high_sweep = True
+            if not kz1_low_sweep and row_low < kz1_low:   kz1_low_sweep = True
+
+            if (kz1_long_setup_valid and kz1_low_sweep and bear_fvg_start >= 0 and row_close > bear_fvg_top):
+                sl_price = bear_fvg_sl
+                sig_idx[n_sig], sig_is_bull[n_sig] = i, True
+                sig_entry[n_sig], sig_sl[n_sig] = row_close, sl_price
+                n_sig += 1
+                kz1_low_sweep = False
+                bear_fvg_start = -1 # <-- FIX
+
+            if (kz1_short_setup_valid and kz1_high_sweep and bull_fvg_start >= 0 and row_close < bull_fvg_bottom):
+                sl_price = bull_fvg_sl
+                sig_idx[n_sig], sig_is_bull[n_sig] = i, False
+                sig_entry[n_sig], sig_sl[n_sig] = row_close, sl_price
+                n_sig += 1
+                kz1_high_sweep = False
+                bull_fvg_start = -1 # <-- FIX
+
+        if kz2_start <= current_time <= kz2_end:
+            kz2_high = max(kz2_high, row_high) if not np.isnan(kz2_high) else row_high
+            kz2_low = min(kz2_low, row_low) if not np.isnan(kz2_low) else row_low
+
+        if current_time == tz2_check and not np.isnan(kz2_high):
+            if row_open > kz2_high: kz2_short_setup_valid = False
+            if row_open < kz2_low:  kz2_long_setup_valid = False
+
+        if tz2_start <= current_time <= tz2_end and not np.isnan(kz2_high):
+            if not kz2_high_sweep and row_high > kz2_high: kz2_high_sweep = True
+            if not kz2_low_sweep and row_low < kz2_low:   kz2_low_sweep = True
+
+            if (kz2_long_setup_valid and kz2_low_sweep and bear_fvg_start >= 0 and row_close > bear_fvg_top):
+                sl_price = bear_fvg_sl
+                sig_idx[n_sig], sig_is_bull[n_sig] = i, True
+                sig_entry[n_sig], sig_sl[n_sig] = row_close, sl_price
+                n_sig += 1
+                kz2_low_sweep = False
+                bear_fvg_start = -1 # <-- FIX
+
+            if (kz2_short_setup_valid and kz2_high_sweep and bull_fvg_start >= 0 and row_close < bull_fvg_bottom):
+                sl_price = bull_fvg_sl
+                sig_idx[n_sig], sig_is_bull[n_sig] = i, False
+                sig_entry[n_sig], sig_sl[n_sig] = row_close, sl_price
+                n_sig += 1
+                kz2_high_sweep = False
+                bull_fvg_start = -1 # <-- FIX
+
+    return sig_idx[:n_sig], sig_is_bull[:n_sig], sig_entry[:n_sig], sig_sl[:n_sig]
 
-from Core.strategy_base import BaseStrategy
 
 class StrategyQ3ifvg(BaseStrategy):
     """
@@ -46,118 +162,64 @@ class StrategyQ3ifvg(BaseStrategy):
         KZ2_START, KZ2_END = time(3, 0), time(3, 44, 59)
         TZ2_START_CHECK, TZ2_START, TZ2_END = time(3, 46), time(3, 46), time(4, 8, 59)
 
-        results = []
-        is_new_candle = df[open_col].ne(df[open_col].shift())
-        candles_to_process = df[is_new_candle]
+        candles_to_process = resampled_view(df, tf)
 
-        current_day = None
-        kz1_high, kz1_low, kz2_high, kz2_low = np.nan, np.nan, np.nan, np.nan
-        kz1_long_setup_valid, kz1_short_setup_valid = True, True
-        kz1_low_sweep, kz1_high_sweep = False, False
-        kz2_long_setup_valid, kz2_short_setup_valid = True, True
-        kz2_low_sweep, kz2_high_sweep = False, False
-        last_bullish_fvg, last_bearish_fvg = None, None
+        # Flatten everything the state machine touches into plain arrays:
+        # OHLC as contiguous float64, times as integer seconds-of-day and
+        # yyyymmdd day keys. The compiled _scan_killzones kernel then runs
+        # the whole sequential scan in native code.
+        o_arr = np.ascontiguousarray(candles_to_process[open_col].to_numpy(), dtype=np.float64)
+        h_arr = np.ascontiguousarray(candles_to_process[high_col].to_numpy(), dtype=np.float64)
+        l_arr = np.ascontiguousarray(candles_to_process[low_col].to_numpy(), dtype=np.float64)
+        c_arr = np.ascontiguousarray(candles_to_process[close_col].to_numpy(), dtype=np.float64)
+        candle_pos = df.attrs[f'_candle_pos_{tf}']
+        seconds_of_day = ny_seconds_of_day(df)[candle_pos].astype(np.int64)
+        ny = candles_to_process['ny_time'].dt
+        day_key = (ny.year * 10000 + ny.month * 100 + ny.day).to_numpy().astype(np.int64)
+
+        def _secs(t: time) -> int:
+            return t.hour * 3600 + t.minute * 60 + t.second
 
         print("Processing candles sequentially...")
-        for i, row in enumerate(candles_to_process.itertuples()):
-            ny_date = row.ny_time.date()
-            current_time = row.ny_time.time()
-
-            if ny_date != current_day:
-                current_day = ny_date
-                kz1_high, kz1_low, kz2_high, kz2_low = np.nan, np.nan, np.nan, np.nan
-                kz1_long_setup_valid, kz1_short_setup_valid = True, True
-                kz1_low_sweep, kz1_high_sweep = False, False
-                kz2_long_setup_valid, kz2_short_setup_valid = True, True
-                kz2_low_sweep, kz2_high_sweep = False, False
-                last_bullish_fvg, last_bearish_fvg = None, None
-
-            row_high, row_low, row_open, row_close = getattr(row, high_col), getattr(row, low_col), getattr(row, open_col), getattr(row, close_col)
-
-            if i >= 2:
-                prev_row2 = candles_to_process.iloc[i-2]
-                if row_low > prev_row2[high_col]: last_bullish_fvg = {'bottom': prev_row2[high_col], 'start_idx': prev_row2.name}
-                if row_high < prev_row2[low_col]: last_bearish_fvg = {'top': prev_row2[low_col], 'start_idx': prev_row2.name}
-
-            if KZ1_START <= current_time <= KZ1_END:
-                kz1_high = max(kz1_high, row_high) if not np.isnan(kz1_high) else row_high
-                kz1_low = min(kz1_low, row_low) if not np.isnan(kz1_low) else row_low
-
-            if current_time == TZ1_START_CHECK and not np.isnan(kz1_high):
-                if row_open > kz1_high: kz1_short_setup_valid = False
-                if row_open < kz1_low:  kz1_long_setup_valid = False
-
-            if TZ1_START <= current_time <= TZ1_END and not np.isnan(kz1_high):
-                if not kz1_high_sweep and row_high > kz1_high: kz1_high_sweep = True
-                if not kz1_low_sweep and row_low < kz1_low:   kz1_low_sweep = True
-
-                if (kz1_long_setup_valid and kz1_low_sweep and last_bearish_fvg and row_close > last_bearish_fvg['top']):
-                    sl_range_df = df.loc[last_bearish_fvg['start_idx']:row.Index]
-                    sl_price = sl_range_df[low_col].min()
-                    results.append({'timestamp': row.Index, 'is_bullish': True, 'is_bearish': False, 'entry_price': row_close, 'sl_price_long': sl_price})
-                    kz1_low_sweep = False
-                    last_bearish_fvg = None # <-- FIX
-                
-                if (kz1_short_setup_valid and kz1_high_sweep and last_bullish_fvg and row_close < last_bullish_fvg['bottom']):
-                    sl_range_df = df.loc[last_bullish_fvg['start_idx']:row.Index]
-                    sl_price = sl_range_df[high_col].max()
-                    results.append({'timestamp': row.Index, 'is_bullish': False, 'is_bearish': True, 'entry_price': row_close, 'sl_price_short': sl_price})
-                    kz1_high_sweep = False
-                    last_bullish_fvg = None # <-- FIX
-
-            if KZ2_START <= current_time <= KZ2_END:
-                kz2_high = max(kz2_high, row_high) if not np.isnan(kz2_high) else row_high
-                kz2_low = min(kz2_low, row_low) if not np.isnan(kz2_low) else row_low
-
-            if current_time == TZ2_START_CHECK and not np.isnan(kz2_high):
-                if row_open > kz2_high: kz2_short_setup_valid = False
-                if row_open < kz2_low:  kz2_long_setup_valid = False
-
-            if TZ2_START <= current_time <= TZ2_END and not np.isnan(kz2_high):
-                if not kz2_high_sweep and row_high > kz2_high: kz2_high_sweep = True
-                if not kz2_low_sweep and row_low < kz2_low:   kz2_low_sweep = True
-
-                if (kz2_long_setup_valid and kz2_low_sweep and last_bearish_fvg and row_close > last_bearish_fvg['top']):
-                    sl_range_df = df.loc[last_bearish_fvg['start_idx']:row.Index]
-                    sl_price = sl_range_df[low_col].min()
-                    results.append({'timestamp': row.Index, 'is_bullish': True, 'is_bearish': False, 'entry_price': row_close, 'sl_price_long': sl_price})
-                    kz2_low_sweep = False
-                    last_bearish_fvg = None # <-- FIX
-                
-                if (kz2_short_setup_valid and kz2_high_sweep and last_bullish_fvg and row_close < last_bullish_fvg['bottom']):
-                    sl_range_df = df.loc[last_bullish_fvg['start_idx']:row.Index]
-                    sl_price = sl_range_df[high_col].max()
-                    results.append({'timestamp': row.Index, 'is_bullish': False, 'is_bearish': True, 'entry_price': row_close, 'sl_price_short': sl_price})
-                    kz2_high_sweep = False
-                    last_bullish_fvg = None # <-- FIX
-
-        if not results:
+        sig_idx, sig_is_bull, sig_entry, sig_sl = _scan_killzones(
+            o_arr, h_arr, l_arr, c_arr, seconds_of_day, day_key,
+            _secs(KZ1_START), _secs(KZ1_END), _secs(TZ1_START_CHECK), _secs(TZ1_START), _secs(TZ1_END),
+            _secs(KZ2_START), _secs(KZ2_END), _secs(TZ2_START_CHECK), _secs(TZ2_START), _secs(TZ2_END))
+
+        if len(sig_idx) == 0:
             print("--- No Q3_iFVG signals found for this period. ---")
-            conditions_df = pd.DataFrame(index=df.index)
-            for col in ['base_pattern_cond', 'is_bullish', 'is_bearish', 'session_cond']:
-                conditions_df[col] = False
-            for col in ['entry_price', 'sl_price_long', 'sl_price_short']:
-                conditions_df[col] = np.nan
-            return conditions_df
-
-        signals_df = pd.DataFrame(results).set_index('timestamp')
-        conditions_df = pd.DataFrame(index=df.index)
-        
-        if 'sl_price_long' not in signals_df.columns: signals_df['sl_price_long'] = np.nan
-        if 'sl_price_short' not in signals_df.columns: signals_df['sl_price_short'] = np.nan
-
-        conditions_df['is_bullish'] = signals_df['is_bullish'].reindex(df.index, fill_value=False)
-        conditions_df['is_bearish'] = signals_df['is_bearish'].reindex(df.index, fill_value=False)
-        conditions_df['base_pattern_cond'] = conditions_df['is_bullish'] | conditions_df['is_bearish']
-        
-        conditions_df['entry_price'] = signals_df['entry_price'].reindex(df.index)
-        conditions_df['sl_price_long'] = signals_df['sl_price_long'].reindex(df.index)
-        conditions_df['sl_price_short'] = signals_df['sl_price_short'].reindex(df.index)
-        
-        df_ny_time = df['ny_time'].dt.time
-        is_in_tz1 = (df_ny_time >= TZ1_START) & (df_ny_time <= TZ1_END)
-        is_in_tz2 = (df_ny_time >= TZ2_START) & (df_ny_time <= TZ2_END)
-        conditions_df['session_cond'] = is_in_tz1 | is_in_tz2
-        
-        print(f"--- Found {len(signals_df)} potential Q3_iFVG signals. ---")
+            return empty_conditions_df(df.index)
+
+        # The kernel reports signals by candle position; the cached candle
+        # positions from resampled_view map those straight to tick positions,
+        # so each output column is an O(k) scatter into a preallocated array
+        # instead of a full-length DatetimeIndex reindex.
+        sig_pos = candle_pos[sig_idx]
+        n_ticks = len(df)
+        is_bullish = np.zeros(n_ticks, dtype=bool)
+        is_bearish = np.zeros(n_ticks, dtype=bool)
+        entry_price = np.full(n_ticks, np.nan)
+        sl_price_long = np.full(n_ticks, np.nan)
+        sl_price_short = np.full(n_ticks, np.nan)
+        is_bullish[sig_pos] = sig_is_bull
+        is_bearish[sig_pos] = ~sig_is_bull
+        entry_price[sig_pos] = sig_entry
+        sl_price_long[sig_pos] = np.where(sig_is_bull, sig_sl, np.nan)
+        sl_price_short[sig_pos] = np.where(sig_is_bull, np.nan, sig_sl)
+
+        tick_sod = ny_seconds_of_day(df)
+        is_in_tz1 = (tick_sod >= _secs(TZ1_START)) & (tick_sod <= _secs(TZ1_END))
+        is_in_tz2 = (tick_sod >= _secs(TZ2_START)) & (tick_sod <= _secs(TZ2_END))
+
+        conditions_df = pd.DataFrame({
+            'is_bullish': is_bullish,
+            'is_bearish': is_bearish,
+            'base_pattern_cond': is_bullish | is_bearish,
+            'entry_price': entry_price,
+            'sl_price_long': sl_price_long,
+            'sl_price_short': sl_price_short,
+            'session_cond': is_in_tz1 | is_in_tz2,
+        }, index=df.index)
+
+        print(f"--- Found {len(sig_idx)} potential Q3_iFVG signals. ---")
         return conditions_df
\ No newline at end of file
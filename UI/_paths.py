@@ -0,0 +1,13 @@
+# In UI/_paths.py
+import os
+import sys
+
+# Resolved once at import and shared by every UI window, instead of each
+# module re-deriving the project root (and re-joining Data) for itself.
+# Handles both running from source and a frozen exe.
+if getattr(sys, 'frozen', False):
+    PROJECT_ROOT = os.path.dirname(sys.executable)
+else:
+    PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DATA_DIR = os.path.join(PROJECT_ROOT, 'Data')
@@ -3,39 +3,100 @@ import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext, TclError
 from tkcalendar import DateEntry
 import os
+import compileall
 import importlib
-import pkgutil
+import importlib.util
 from datetime import time
 import sys
+import functools
 import threading
+import multiprocessing
+import queue
 import traceback
-import inspect
 import Strategies
 
 
 from Core.strategy_base import BaseStrategy
 from typing import List, Optional
 
-def get_project_root():
-    """Gets the project root, handling both script and frozen exe."""
-    if getattr(sys, 'frozen', False):
-        return os.path.dirname(sys.executable)
-    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-
-project_root = get_project_root()
+from UI._paths import PROJECT_ROOT as project_root, DATA_DIR
 
 from Core.main import run_full_backtest
 from Core.visualizer import open_file
 
+# Strategy classes already loaded this session, keyed by module path. The
+# source file's mtime is stored alongside so edits during development still
+# trigger a reload, but plain UI interactions reuse the cached class.
+_STRATEGY_CACHE = {}
+
+# Cached asset list keyed by the Data directory's mtime, so reopening the
+# dropdown doesn't re-stat every folder unless something was added/removed.
+_ASSET_CACHE = None
+
+# Half-hour session times never change; build them once at import.
+_TIME_VALUES = tuple(f"{h:02d}:{m:02d}" for h in range(24) for m in (0, 30))
+
+# Set in the worker process by _pool_worker_init; queues can't travel as
+# task arguments, so the pool worker receives its result queue at startup.
+_WORKER_QUEUE = None
+
+def _pool_worker_init(result_queue):
+    global _WORKER_QUEUE
+    _WORKER_QUEUE = result_queue
+
+def _backtest_worker(asset_name, start_date, end_date, scenarios,
+                     strategy_path, strategy_params, selected_filters, allow_multiple_trades):
+    """
+    Child-process entry point for a backtest run.
+
+    Runs in its own interpreter so the pandas-heavy compute never contends
+    with the Tk event loop for the GIL. The strategy is rebuilt here from its
+    module path (live instances don't pickle), and results/log lines flow
+    back through the worker queue as ('log'|'done'|'error', payload) tuples.
+    """
+    result_queue = _WORKER_QUEUE
+    try:
+        module = importlib.import_module(strategy_path)
+        strategy_instance = None
+        for obj in vars(module).values():
+            if isinstance(obj, type) and obj is not BaseStrategy and issubclass(obj, BaseStrategy):
+                strategy_instance = obj()
+                break
+        if strategy_instance is None:
+            raise ValueError(f"Could not load strategy from {strategy_path}")
+        report_path = run_full_backtest(
+            asset_name, start_date, end_date, scenarios,
+            strategy_instance=strategy_instance,
+            strategy_params=strategy_params,
+            selected_filters=selected_filters,
+            allow_multiple_trades=allow_multiple_trades,
+            status_callback=lambda msg: result_queue.put(('log', msg))
+        )
+        result_queue.put(('done', report_path))
+    except Exception as e:
+        # A one-line summary for the dialog; the full traceback rides along
+        # separately and lands in the (line-capped) status log instead of a
+        # multi-KB messagebox.
+        result_queue.put(('error', (f"{type(e).__name__}: {e}", traceback.format_exc())))
+
 def get_available_assets() -> List[str]:
     """Scans the Data directory to find available assets for testing."""
-    data_path = os.path.join(project_root, 'Data')
-    assets = []
-    if os.path.exists(data_path):
-        for folder_name in os.listdir(data_path):
-            if folder_name.endswith('_resampled') and os.path.isdir(os.path.join(data_path, folder_name)):
-                assets.append(folder_name.replace('_resampled', ''))
-    return sorted(assets)
+    global _ASSET_CACHE
+    data_path = DATA_DIR
+    if not os.path.exists(data_path):
+        return []
+    mtime = os.path.getmtime(data_path)
+    if _ASSET_CACHE and _ASSET_CACHE[0] == mtime:
+        return _ASSET_CACHE[1]
+    # scandir entries carry the dirent type, so no extra stat per folder.
+    with os.scandir(data_path) as it:
+        assets = sorted(
+            entry.name[:-len('_resampled')]
+            for entry in it
+            if entry.name.endswith('_resampled') and entry.is_dir(follow_symlinks=False)
+        )
+    _ASSET_CACHE = (mtime, assets)
+    return assets
 
 class BacktesterUI(tk.Toplevel):
     """The main UI window for configuring and running backtests."""
@@ -46,7 +107,11 @@ class BacktesterUI(tk.Toplevel):
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
         self.title("Backtester")
         self.geometry("500x800")
-        self.backtest_thread = None
+        self._pool = None
+        self._result_queue = None
+        self._backtest_result = None
+        self._strategy_list_cache = None
+        self._log_queue = queue.SimpleQueue()
 
         main_frame = ttk.Frame(self, padding="10")
         main_frame.pack(fill="both", expand=True)
@@ -73,15 +138,15 @@ class BacktesterUI(tk.Toplevel):
         self.conditions_frame = ttk.LabelFrame(main_frame, text="Strategy Conditions to Test")
         self.conditions_frame.grid(row=4, column=0, columnspan=2, padx=10, pady=10, sticky='ew')
         self.filter_vars = {}
+        self._filter_widgets = {}
 
         self.session_options_frame = ttk.LabelFrame(main_frame, text="Session Filter (NY Time)")
         self.session_options_frame.grid(row=5, column=0, columnspan=2, padx=10, pady=10, sticky='ew')
-        time_values = [f"{h:02d}:{m:02d}" for h in range(24) for m in (0, 30)]
         self.session_start_label = ttk.Label(self.session_options_frame, text="Session Start:")
-        self.session_start_dropdown = ttk.Combobox(self.session_options_frame, values=time_values, width=8, state="readonly")
+        self.session_start_dropdown = ttk.Combobox(self.session_options_frame, values=_TIME_VALUES, width=8, state="readonly")
         self.session_start_dropdown.set("22:00")
         self.session_end_label = ttk.Label(self.session_options_frame, text="Session End:")
-        self.session_end_dropdown = ttk.Combobox(self.session_options_frame, values=time_values, width=8, state="readonly")
+        self.session_end_dropdown = ttk.Combobox(self.session_options_frame, values=_TIME_VALUES, width=8, state="readonly")
         self.session_end_dropdown.set("07:00")
 
         scenarios_frame = ttk.LabelFrame(main_frame, text="Exit Scenarios (RR)")
@@ -109,23 +174,72 @@ class BacktesterUI(tk.Toplevel):
         self.back_button.grid(row=10, column=0, columnspan=2, pady=(10, 0))
 
         main_frame.grid_columnconfigure(1, weight=1)
+        # Populate after the first paint: on_strategy_select may import a
+        # strategy module (and with it pandas/numpy), which would otherwise
+        # delay the window appearing.
+        self.after_idle(self._initial_populate)
+        self.after(50, self._drain_log)
+        threading.Thread(target=self._prewarm_strategies, daemon=True).start()
+
+    def _initial_populate(self):
         self.populate_assets()
         self.populate_strategies()
         self.on_strategy_select()
 
+    def _prewarm_strategies(self):
+        """
+        Imports every discovered strategy module in the background so the
+        first dropdown selection hits _STRATEGY_CACHE instead of paying the
+        full import cost on the UI thread.
+        """
+        for entry in os.scandir(Strategies.__path__[0]):
+            if not (entry.is_file() and entry.name.startswith('strategy_') and entry.name.endswith('.py')):
+                continue
+            module_path = f"{Strategies.__name__}.{entry.name[:-3]}"
+            if module_path in _STRATEGY_CACHE:
+                continue
+            try:
+                module = importlib.import_module(module_path)
+                mtime = entry.stat().st_mtime
+                for obj in vars(module).values():
+                    if isinstance(obj, type) and obj is not BaseStrategy and issubclass(obj, BaseStrategy):
+                        _STRATEGY_CACHE.setdefault(module_path, (mtime, obj))
+                        break
+            except ImportError:
+                pass
+
     def update_log(self, message):
-        def task():
+        # Called from the backtest thread, possibly thousands of times per
+        # run. Just enqueue; _drain_log flushes everything pending as a
+        # single insert so the widget redraws at most every 50ms.
+        self._log_queue.put(message)
+
+    def _drain_log(self):
+        lines = []
+        while True:
             try:
+                lines.append(self._log_queue.get_nowait().strip())
+            except queue.Empty:
+                break
+        try:
+            if lines:
                 self.log_widget.config(state='normal')
-                self.log_widget.insert(tk.END, message.strip() + "\n")
+                self.log_widget.insert(tk.END, "\n".join(lines) + "\n")
+                # Keep the widget bounded: Tk insert cost grows with the
+                # number of lines, so drop the oldest past the last 2000.
+                line_count = int(self.log_widget.index('end-1c').split('.')[0])
+                if line_count > 2000:
+                    self.log_widget.delete('1.0', f'{line_count - 2000}.0')
                 self.log_widget.config(state='disabled')
                 self.log_widget.see(tk.END)
-            except TclError: pass
-        self.after(0, task)
+            self.after(50, self._drain_log)
+        except TclError: pass
 
     def on_closing(self):
-        if self.backtest_thread and self.backtest_thread.is_alive():
+        if self._backtest_result is not None and not self._backtest_result.ready():
             if not messagebox.askokcancel("Quit?", "A backtest is running. Are you sure you want to quit?"): return
+        if self._pool is not None:
+            self._pool.terminate()
         self.destroy()
         if hasattr(self, 'master_app') and self.master_app: self.master_app.deiconify()
 
@@ -142,12 +256,25 @@ class BacktesterUI(tk.Toplevel):
         if not module_path:
             return None
         try:
-            module = importlib.import_module(module_path)
-            importlib.reload(module)  # Reload to get the latest changes during development
-            for name, obj in inspect.getmembers(module):
-                if inspect.isclass(obj) and issubclass(obj, BaseStrategy) and obj is not BaseStrategy:
+            spec = importlib.util.find_spec(module_path)
+            mtime = os.path.getmtime(spec.origin) if spec and spec.origin else None
+            cached = _STRATEGY_CACHE.get(module_path)
+            if cached and cached[0] == mtime:
+                return cached[1]()  # Source unchanged; skip the reload entirely
+
+            importlib.invalidate_caches()
+            module = sys.modules.get(module_path)
+            if module is None:
+                module = importlib.import_module(module_path)
+            else:
+                module = importlib.reload(module)  # Pick up edits made during development
+            # A plain walk over the module dict: getmembers sorts and getattrs
+            # the whole namespace just to find the one strategy class.
+            for obj in vars(module).values():
+                if isinstance(obj, type) and obj is not BaseStrategy and issubclass(obj, BaseStrategy):
+                    _STRATEGY_CACHE[module_path] = (mtime, obj)
                     return obj()  # Instantiate the class
-        except (ImportError, AttributeError) as e:
+        except (ImportError, AttributeError, OSError) as e:
             print(f"Could not get strategy instance from {module_path}: {e}")
         return None
 
@@ -156,8 +283,11 @@ class BacktesterUI(tk.Toplevel):
         Handles the event when a new strategy is selected from the dropdown.
         It dynamically updates the UI to show the relevant filters and session options.
         """
-        for widget in self.session_options_frame.winfo_children(): widget.grid_forget()
-        for widget in self.conditions_frame.winfo_children(): widget.grid_forget()
+        # grid_remove keeps each widget (and its grid options) alive, so
+        # switching strategies only toggles visibility instead of destroying
+        # and recreating Tk widgets every time.
+        for widget in self.session_options_frame.winfo_children(): widget.grid_remove()
+        for widget in self.conditions_frame.winfo_children(): widget.grid_remove()
         self.filter_vars.clear()
 
         strategy_instance = self.get_strategy_instance(self.strategy_var.get())
@@ -172,47 +302,66 @@ class BacktesterUI(tk.Toplevel):
 
         if strategy_instance.AVAILABLE_FILTERS:
             for i, filter_name in enumerate(strategy_instance.AVAILABLE_FILTERS):
-                var = tk.BooleanVar()
-                chk = ttk.Checkbutton(self.conditions_frame, text=f"Use {filter_name} Condition", variable=var)
+                if filter_name not in self._filter_widgets:
+                    var = tk.BooleanVar()
+                    chk = ttk.Checkbutton(self.conditions_frame, text=f"Use {filter_name} Condition", variable=var)
+                    self._filter_widgets[filter_name] = (var, chk)
+                var, chk = self._filter_widgets[filter_name]
                 chk.grid(row=i, column=0, padx=5, pady=2, sticky='w')
                 self.filter_vars[filter_name] = var
 
     def populate_assets(self):
         """Populates the asset dropdown with available resampled asset data."""
         assets = get_available_assets()
-        self.asset_dropdown['values'] = assets
-        if assets: self.asset_dropdown.current(0)
+        if tuple(self.asset_dropdown['values']) != tuple(assets):
+            self.asset_dropdown['values'] = assets
+            if assets: self.asset_dropdown.current(0)
 
     def populate_strategies(self):
         """Discovers and populates the strategy dropdown with all valid strategy modules."""
-        strats = []
-        for importer, modname, ispkg in pkgutil.walk_packages(path=Strategies.__path__, prefix=Strategies.__name__ + '.', onerror=lambda x: None):
-            if modname.split('.')[-1].startswith('strategy_'):
-                strats.append(modname)
-        self.strategy_dropdown['values'] = sorted(strats)
+        # This runs as the combobox postcommand, i.e. on every dropdown open;
+        # only re-walk the package when the Strategies directory changed.
+        mtime = max(os.path.getmtime(p) for p in Strategies.__path__)
+        if self._strategy_list_cache and self._strategy_list_cache[0] == mtime:
+            strats = self._strategy_list_cache[1]
+        else:
+            # A plain directory scan: unlike pkgutil.walk_packages, this does
+            # not import every strategy module just to list it — modules load
+            # only when actually selected.
+            strats = sorted(
+                f"{Strategies.__name__}.{entry.name[:-3]}"
+                for entry in os.scandir(Strategies.__path__[0])
+                if entry.is_file() and entry.name.startswith('strategy_') and entry.name.endswith('.py')
+            )
+            # Warm __pycache__ while we're here so the first real import of
+            # a strategy unmarshals the cached .pyc instead of reparsing.
+            compileall.compile_dir(Strategies.__path__[0], quiet=1)
+            self._strategy_list_cache = (mtime, strats)
+        if tuple(self.strategy_dropdown['values']) != tuple(strats):
+            self.strategy_dropdown['values'] = strats
         if strats and not self.strategy_var.get(): self.strategy_dropdown.current(0)
 
-    def backtest_logic(self, *args):
-        asset_name, start_date, end_date, scenarios, strategy_instance, strategy_params, selected_filters, allow_multiple_trades, log_callback = args
-        try:
-            report_path = run_full_backtest(
-                asset_name, start_date, end_date, scenarios,
-                strategy_instance=strategy_instance,
-                strategy_params=strategy_params,
-                selected_filters=selected_filters,
-                allow_multiple_trades=allow_multiple_trades,
-                status_callback=log_callback
-            )
-            if report_path and os.path.exists(report_path):
-                self.after(0, lambda p=report_path: self.on_backtest_success(p))
+    def _watch_backtest(self, asset_name):
+        # Small UI-side thread that forwards child-process output: log lines
+        # into the batched log queue, then one terminal 'done'/'error' event.
+        while True:
+            kind, payload = self._result_queue.get()
+            if kind == 'log':
+                self.update_log(payload)
+                continue
+            if kind == 'done':
+                if payload and os.path.exists(payload):
+                    self.after(0, functools.partial(self.on_backtest_success, payload))
+                else:
+                    self.after(0, functools.partial(messagebox.showinfo, "Success", f"Backtest for {asset_name} complete! No trades were taken or report was not generated."))
             else:
-                self.after(0, lambda: messagebox.showinfo("Success", f"Backtest for {asset_name} complete! No trades were taken or report was not generated."))
-        except Exception as e:
-            tb = traceback.format_exc()
-            self.after(0, lambda: messagebox.showerror("Backtest Failed", f"An error occurred during the backtest:\n\n{e}\n\n{tb}"))
-        finally:
-            self.after(0, self.on_task_complete)
-    
+                summary, tb = payload
+                self.update_log(tb)
+                self.after(0, functools.partial(messagebox.showerror, "Backtest Failed", f"An error occurred during the backtest:\n\n{summary}\n\nThe full traceback is in the status log."))
+            break
+        self.after(0, self.on_task_complete)
+
+
     def on_backtest_success(self, report_path):
         if messagebox.askyesno("Success", f"Backtest complete! Report saved to:\n{report_path}\n\nDo you want to open it now?"):
             open_file(report_path)
@@ -227,8 +376,10 @@ class BacktesterUI(tk.Toplevel):
             strategy_path = self.strategy_var.get()
             if not asset_name or not strategy_path: raise ValueError("Asset and Strategy must be selected.")
             
-            start_date = self.start_date_entry.get_date().strftime('%Y-%m-%d')
-            end_date = self.end_date_entry.get_date().strftime('%Y-%m-%d')
+            # isoformat() gives the same YYYY-MM-DD without the strftime
+            # format-string machinery.
+            start_date = self.start_date_entry.get_date().isoformat()
+            end_date = self.end_date_entry.get_date().isoformat()
 
             strategy_instance = self.get_strategy_instance(strategy_path)
             if not strategy_instance:
@@ -244,12 +395,9 @@ class BacktesterUI(tk.Toplevel):
                     strategy_params['session_end_str'] = end_str
                 elif start_str or end_str: raise ValueError("Both session start and end times must be provided.")
 
-            scenarios = []
-            for entry in self.scenario_entries:
-                rr_str = entry['rr'].get()
-                if rr_str:
-                    rr = float(rr_str); use_be = entry['be'].get()
-                    scenarios.append({'rr': rr, 'use_be': use_be, 'be_trigger_r': rr / 2.0})
+            rows = [(entry['rr'].get(), entry['be'].get()) for entry in self.scenario_entries]
+            scenarios = [{'rr': (rr := float(rr_str)), 'use_be': use_be, 'be_trigger_r': rr / 2.0}
+                         for rr_str, use_be in rows if rr_str]
             if not scenarios: raise ValueError("Please define at least one RR scenario.")
         except Exception as e:
             messagebox.showerror("Input Error", f"Please check your inputs: {e}"); return
@@ -257,15 +405,24 @@ class BacktesterUI(tk.Toplevel):
         self.run_button.config(text="Running...", state="disabled")
         self.log_widget.config(state='normal'); self.log_widget.delete('1.0', tk.END); self.log_widget.config(state='disabled')
         
-        log_callback = lambda msg: self.update_log(msg)
         allow_multiple_trades = self.multi_trade_var.get()
-        args = (asset_name, start_date, end_date, scenarios, strategy_instance, strategy_params, selected_filters, allow_multiple_trades, log_callback)
-        
-        self.backtest_thread = threading.Thread(target=self.backtest_logic, args=args, daemon=True)
-        self.backtest_thread.start()
+
+        # Run the backtest in a separate process, not a thread: the pandas
+        # compute would otherwise hold the GIL and starve the Tk event loop.
+        # The single-worker pool persists across runs, so pandas/numpy import
+        # and interpreter startup are paid once per session, not per click.
+        if self._pool is None:
+            ctx = multiprocessing.get_context('spawn')
+            self._result_queue = ctx.Queue()
+            self._pool = ctx.Pool(1, initializer=_pool_worker_init, initargs=(self._result_queue,))
+        self._backtest_result = self._pool.apply_async(
+            _backtest_worker,
+            args=(asset_name, start_date, end_date, scenarios,
+                  strategy_path, strategy_params, selected_filters, allow_multiple_trades))
+        threading.Thread(target=self._watch_backtest, args=(asset_name,), daemon=True).start()
 
     def on_task_complete(self):
         try:
             self.run_button.config(text="Run Backtest", state="normal")
-            self.backtest_thread = None
+            self._backtest_result = None
         except TclError: pass
\ No newline at end of file
@@ -4,17 +4,13 @@ from tkinter import ttk, messagebox, TclError, scrolledtext
 from tkcalendar import DateEntry
 import os
 import sys
+import functools
 import threading
+import queue
 import shutil
 
 # --- THIS IS THE FIX ---
-def get_project_root():
-    """Gets the project root, handling both script and frozen exe."""
-    if getattr(sys, 'frozen', False):
-        return os.path.dirname(sys.executable)
-    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-
-project_root = get_project_root()
+from UI._paths import PROJECT_ROOT as project_root, DATA_DIR
 # --- END OF FIX ---
 
 if project_root not in sys.path:
@@ -38,6 +34,7 @@ class DownloaderUI(tk.Toplevel):
         self.geometry("500x500")
 
         self.pipeline_thread = None
+        self._log_queue = queue.SimpleQueue()
 
         main_frame = ttk.Frame(self, padding="10")
         main_frame.pack(fill="both", expand=True)
@@ -94,16 +91,34 @@ class DownloaderUI(tk.Toplevel):
         main_frame.grid_rowconfigure(1, weight=1)
         main_frame.grid_columnconfigure(1, weight=1)
         self.on_mode_select()
+        self.after(50, self._drain_log)
 
     def update_log(self, log_widget, message):
-        def task():
+        # Called from the pipeline thread for every status line. Enqueue and
+        # let _drain_log flush all pending lines as one insert per widget.
+        self._log_queue.put((log_widget, message))
+
+    def _drain_log(self):
+        pending = {}
+        while True:
             try:
+                log_widget, message = self._log_queue.get_nowait()
+                pending.setdefault(log_widget, []).append(message)
+            except queue.Empty:
+                break
+        try:
+            for log_widget, lines in pending.items():
                 log_widget.config(state='normal')
-                log_widget.insert(tk.END, message + "\n")
+                log_widget.insert(tk.END, "\n".join(lines) + "\n")
+                # Keep the widget bounded: Tk insert cost grows with the
+                # number of lines, so drop the oldest past the last 2000.
+                line_count = int(log_widget.index('end-1c').split('.')[0])
+                if line_count > 2000:
+                    log_widget.delete('1.0', f'{line_count - 2000}.0')
                 log_widget.config(state='disabled')
                 log_widget.see(tk.END)
-            except TclError: pass 
-        self.after(0, task)
+            self.after(50, self._drain_log)
+        except TclError: pass
 
     def on_closing(self):
         if self.pipeline_thread and self.pipeline_thread.is_alive():
@@ -130,7 +145,7 @@ class DownloaderUI(tk.Toplevel):
         
         instrument = self.instrument_var.get()
         granularity = self.granularity_var.get()
-        data_folder = os.path.join(project_root, 'Data')
+        data_folder = DATA_DIR
         raw_folder_path = os.path.join(data_folder, f"{instrument}_{granularity}")
 
         if os.path.exists(raw_folder_path):
@@ -140,25 +155,26 @@ class DownloaderUI(tk.Toplevel):
         
         self.pipeline_thread = threading.Thread(target=self.new_download_logic, args=(raw_folder_path, instrument, granularity), daemon=True)
         self.pipeline_thread.start()
-        self.after(100, lambda: self.check_thread_status(self.new_download_button))
 
     def new_download_logic(self, folder_path, instrument, granularity):
-        log_callback = lambda msg: self.update_log(self.new_download_log, msg)
+        log_callback = functools.partial(self.update_log, self.new_download_log)
         try:
             if os.path.exists(folder_path):
                 log_callback(f"Deleting existing folder: {os.path.basename(folder_path)}")
                 shutil.rmtree(folder_path)
             
-            start_date = self.start_date_entry.get_date().strftime('%Y-%m-%d')
+            start_date = self.start_date_entry.get_date().isoformat()
             run_download(instrument=instrument, granularity=granularity, start_date_str=start_date, status_callback=log_callback)
             
             log_callback("\n--- Analyzing downloaded data ---")
             report_string = analyze_raw_data(folder_path)
             log_callback(report_string)
-            self.after(0, lambda: messagebox.showinfo("Complete", "New download process finished successfully. Please launch the Healer."))
+            self.after(0, functools.partial(messagebox.showinfo, "Complete", "New download process finished successfully. Please launch the Healer."))
         except Exception as e:
             log_callback(f"\nFATAL ERROR: {e}")
-            self.after(0, lambda: messagebox.showerror("Download Failed", f"An error occurred: {e}"))
+            self.after(0, functools.partial(messagebox.showerror, "Download Failed", f"An error occurred: {e}"))
+        finally:
+            self.after(0, functools.partial(self._on_pipeline_done, self.new_download_button))
 
     def start_update_pipeline(self):
         self.update_all_button.config(state="disabled")
@@ -166,14 +182,19 @@ class DownloaderUI(tk.Toplevel):
         self.update_all_log.delete('1.0', tk.END)
         self.update_all_log.config(state='disabled')
         
-        log_callback = lambda msg: self.update_log(self.update_all_log, msg)
-        self.pipeline_thread = threading.Thread(target=run_full_update, args=(log_callback,), daemon=True)
+        log_callback = functools.partial(self.update_log, self.update_all_log)
+
+        def update_all_logic():
+            try:
+                run_full_update(log_callback)
+            finally:
+                self.after(0, functools.partial(self._on_pipeline_done, self.update_all_button))
+
+        self.pipeline_thread = threading.Thread(target=update_all_logic, daemon=True)
         self.pipeline_thread.start()
-        self.after(100, lambda: self.check_thread_status(self.update_all_button))
 
-    def check_thread_status(self, button_to_enable):
-        if self.pipeline_thread and self.pipeline_thread.is_alive():
-            self.after(100, lambda: self.check_thread_status(button_to_enable))
-        else:
-            try: button_to_enable.config(state="normal")
-            except TclError: pass
\ No newline at end of file
+    def _on_pipeline_done(self, button_to_enable):
+        # Posted by the worker thread as it exits; replaces the old 100ms
+        # is_alive() polling loop, so the event loop stays idle during runs.
+        try: button_to_enable.config(state="normal")
+        except TclError: pass
\ No newline at end of file
@@ -2,41 +2,93 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext, TclError
 import pandas as pd
+import numpy as np
+import pyarrow.parquet as pq
 import os
 import sys
 import threading
+import queue
 import subprocess
 import math
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from openpyxl.utils import get_column_letter
 
-def get_project_root():
-    # ... (function is unchanged) ...
-    if getattr(sys, 'frozen', False): return os.path.dirname(sys.executable)
-    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-project_root = get_project_root()
+from UI._paths import PROJECT_ROOT as project_root, DATA_DIR
 
 def open_file(filepath):
     # ... (function is unchanged) ...
     try:
         if sys.platform == "win32": os.startfile(os.path.normpath(filepath))
-        else: subprocess.call(["open" if sys.platform == "darwin" else "xdg-open", filepath])
+        else: subprocess.Popen(["open" if sys.platform == "darwin" else "xdg-open", filepath],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
     except Exception as e: messagebox.showerror("Error", f"Could not open file:\n{e}")
 
+# Trading hours per weekday (Mon..Sun): full days Mon-Thu, Friday close,
+# Saturday shut, Sunday open.
+_TRADING_HOURS_BY_WEEKDAY = np.array([24, 24, 24, 24, 17, 0, 7], dtype=np.int64)
+
+@lru_cache(maxsize=None)
+def _seconds_per_candle(timeframe_str):
+    """Parses a timeframe string once; repeat lookups are a dict hit."""
+    try:
+        return pd.to_timedelta(timeframe_str).total_seconds()
+    except (ValueError, TypeError):
+        return 0
+
+@lru_cache(maxsize=4096)
+def _theoretical_candles(weekday, timeframe_str):
+    seconds_per_candle = _seconds_per_candle(timeframe_str)
+    if seconds_per_candle == 0: return 0
+    return math.floor(_TRADING_HOURS_BY_WEEKDAY[weekday] * 3600 / seconds_per_candle)
+
 def get_theoretical_candles(date, timeframe_str):
-    # ... (function is unchanged) ...
-    weekday = date.weekday()
-    if weekday == 4: trading_hours = 17
-    elif weekday == 5: trading_hours = 0
-    elif weekday == 6: trading_hours = 7
-    else: trading_hours = 24
-    total_seconds_in_day = trading_hours * 3600
+    # Only 7 weekdays exist, so caching on (weekday, timeframe) means each
+    # distinct combination is computed once no matter how many dates pass
+    # through here.
+    return _theoretical_candles(date.weekday(), timeframe_str)
+
+# Per-file daily counts keyed on (path, mtime_ns, size): re-running the
+# audit after adding one timeframe only reads the new/changed files.
+_DAILY_COUNTS_CACHE = {}
+
+def _counts_from_metadata(path):
+    """
+    Per-NY-day row counts from parquet footer statistics alone.
+
+    When every row group's timestamp min/max falls inside a single New York
+    day, the counts are just the row-group sizes — a few KB of footer reads
+    with no column decode. Returns None whenever a group spans days or lacks
+    statistics, and the caller falls back to decoding the index.
+    """
+    pf = pq.ParquetFile(path)
     try:
-        seconds_per_candle = pd.to_timedelta(timeframe_str).total_seconds()
-        if seconds_per_candle == 0: return 0
-        return math.floor(total_seconds_in_day / seconds_per_candle)
-    except (ValueError, TypeError): return 0
+        ts_name = pf.schema_arrow.pandas_metadata['index_columns'][0]
+        ts_idx = pf.schema_arrow.names.index(ts_name)
+    except (TypeError, KeyError, IndexError, ValueError):
+        return None
+    md = pf.metadata
+    counts = {}
+    for i in range(md.num_row_groups):
+        rg = md.row_group(i)
+        cs = rg.column(ts_idx).statistics
+        if cs is None or not cs.has_min_max:
+            return None
+        lo, hi = pd.Timestamp(cs.min), pd.Timestamp(cs.max)
+        if lo.tz is None:
+            lo, hi = lo.tz_localize('UTC'), hi.tz_localize('UTC')
+        lo, hi = lo.tz_convert('America/New_York'), hi.tz_convert('America/New_York')
+        if lo.normalize() != hi.normalize():
+            return None
+        day = lo.normalize()
+        counts[day] = counts.get(day, 0) + rg.num_rows
+    if not counts:
+        return None
+    return pd.Series(counts).sort_index()
 
 # --- THIS FUNCTION IS NOW MODIFIED ---
-def run_analysis(folder_path, status_callback=None):
+def run_analysis(folder_path, status_callback=None, write_excel=True):
     def log(message):
         if status_callback: status_callback(message)
         else: print(message)
@@ -59,47 +111,119 @@ def run_analysis(folder_path, status_callback=None):
     if not parsed_files: return False, "Could not parse any valid timeframe files in the folder."
     
     parsed_files.sort(key=lambda x: x['delta'])
-    master_df = None
-    for file_info in parsed_files:
-        tf_label = file_info['tf_label']; log(f"  -> Processing {tf_label}...")
-        df = pd.read_parquet(file_info['path'])
-        df.index = df.index.tz_localize('UTC') if df.index.tz is None else df.index.tz_convert('UTC')
-        df.index = df.index.tz_convert('America/New_York')
-        daily_counts = df.resample('D').size(); daily_counts.name = f"{tf_label}_Available"
-        master_df = pd.DataFrame(daily_counts) if master_df is None else master_df.join(daily_counts, how='outer')
-        
+
+    def read_daily_counts(file_info):
+        st = os.stat(file_info['path'])
+        cache_key = (file_info['path'], st.st_mtime_ns, st.st_size)
+        cached = _DAILY_COUNTS_CACHE.get(cache_key)
+        if cached is not None:
+            daily_counts = cached.copy()
+            daily_counts.name = f"{file_info['tf_label']}_Available"
+            return daily_counts
+        # Fast path: counts straight from the parquet footer when row groups
+        # align to NY days — no column decode at all.
+        daily_counts = _counts_from_metadata(file_info['path'])
+        if daily_counts is None:
+            # Only the timestamps matter for the daily counts; columns=[]
+            # keeps parquet projection pushdown from decoding any OHLCV data.
+            df = pd.read_parquet(file_info['path'], columns=[])
+            # One tz conversion straight to NY (tz-aware files were
+            # previously bounced through UTC first).
+            idx = df.index
+            ny_index = (idx.tz_localize('UTC') if idx.tz is None else idx).tz_convert('America/New_York')
+            # Per-day counts via np.unique over the int64 view of the
+            # normalized index — one C-level pass, no groupby/resample
+            # machinery; reindex keeps the zero-candle weekend days that
+            # resample used to emit.
+            uniq, counts = np.unique(ny_index.normalize().asi8, return_counts=True)
+            # asi8 is UTC epoch in the index's own unit (parquet files
+            # round-trip as microseconds), so rebuild with that unit and
+            # convert back to NY.
+            day_index = pd.DatetimeIndex(uniq.view(f'datetime64[{ny_index.unit}]')).tz_localize('UTC').tz_convert(ny_index.tz)
+            daily_counts = pd.Series(counts, index=day_index)
+        if len(daily_counts):
+            daily_counts = daily_counts.reindex(
+                pd.date_range(daily_counts.index[0], daily_counts.index[-1], freq='D'), fill_value=0)
+        # Evict any stale entry for this file before caching the new counts.
+        for old_key in [k for k in _DAILY_COUNTS_CACHE if k[0] == file_info['path']]:
+            del _DAILY_COUNTS_CACHE[old_key]
+        _DAILY_COUNTS_CACHE[cache_key] = daily_counts.copy()
+        daily_counts.name = f"{file_info['tf_label']}_Available"
+        return daily_counts
+
+    # pyarrow releases the GIL while reading and decompressing, so the
+    # per-file work runs on a thread pool; this thread only merges results.
+    counts_by_tf = {}
+    with ThreadPoolExecutor(max_workers=min(8, len(parsed_files))) as executor:
+        futures = {executor.submit(read_daily_counts, fi): fi['tf_label'] for fi in parsed_files}
+        for future in as_completed(futures):
+            tf_label = futures[future]
+            counts_by_tf[tf_label] = future.result()
+            log(f"  -> Processing {tf_label}... done")
+
+    # One outer concat over all timeframes instead of pairwise joins that
+    # re-align the index on every iteration.
+    master_df = pd.concat([counts_by_tf[fi['tf_label']] for fi in parsed_files], axis=1)
+
+    # One trading-seconds array for the whole date index; each timeframe's
+    # theoretical count is then a single integer division instead of a
+    # per-row apply that re-parses the timeframe string every call.
+    trading_seconds = _TRADING_HOURS_BY_WEEKDAY[master_df.index.weekday] * 3600
     for file_info in parsed_files:
-        tf_label, pd_tf = file_info['tf_label'], file_info['pd_tf']; log(f"  -> Calculating theoretical counts for {tf_label}...")
-        master_df[f'{tf_label}_Theoretical'] = master_df.index.to_series().apply(lambda d: get_theoretical_candles(d, pd_tf))
+        tf_label = file_info['tf_label']; log(f"  -> Calculating theoretical counts for {tf_label}...")
+        seconds_per_candle = int(file_info['delta'].total_seconds())
+        master_df[f'{tf_label}_Theoretical'] = (
+            trading_seconds // seconds_per_candle if seconds_per_candle else 0)
         
     master_df.fillna(0, inplace=True); master_df = master_df.astype(int); master_df.index.name = 'Date (NY)'
     final_columns = [col for tf_info in parsed_files for col in (f"{tf_info['tf_label']}_Available", f"{tf_info['tf_label']}_Theoretical")]
     master_df = master_df[final_columns]; master_df.index = master_df.index.tz_localize(None)
+
+    if not write_excel:
+        # Arrow-native fast path for programmatic consumers: no XML/zip
+        # serialization, zstd-compressed on disk.
+        output_filename = os.path.join(folder_path, "daily_candle_audit.feather")
+        log(f"\n--- Saving report to: {output_filename} ---")
+        master_df.reset_index().to_feather(output_filename, compression='zstd')
+        return True, output_filename
+
     output_filename = os.path.join(folder_path, "daily_candle_audit.xlsx")
-    
+
     log(f"\n--- Saving report to: {output_filename} ---")
     with pd.ExcelWriter(output_filename, engine='openpyxl') as writer:
         master_df.to_excel(writer, sheet_name='Daily Candle Count')
         worksheet = writer.sheets['Daily Candle Count']
-        for column_cells in worksheet.columns:
-            max_length = 0; column = column_cells[0].column_letter
-            for cell in column_cells:
-                try:
-                    if len(str(cell.value)) > max_length: max_length = len(str(cell.value))
-                except: pass
-            adjusted_width = (max_length + 2); worksheet.column_dimensions[column].width = adjusted_width
+        # The schema is fixed by this point — a date index and int columns —
+        # so each width is just the header length against the widest value
+        # (one .max() per column), no per-cell string conversion anywhere.
+        widths = [max(len(str(master_df.index.name)), len('YYYY-MM-DD')) + 2]
+        widths += [
+            max(len(str(col)), len(str(int(master_df[col].max()))) if len(master_df) else 0) + 2
+            for col in master_df.columns
+        ]
+        for i, width in enumerate(widths, start=1):
+            worksheet.column_dimensions[get_column_letter(i)].width = width
             
     return True, output_filename
 
+# Short-lived cache: the combobox postcommand re-scans on every dropdown
+# open, which is wasted syscall traffic when nothing changed.
+_ASSET_CACHE = {'t': 0.0, 'v': []}
+
 def get_available_resampled_assets():
-    # ... (function is unchanged) ...
-    data_path = os.path.join(project_root, 'Data')
-    available_assets = []
+    now = time.monotonic()
+    if now - _ASSET_CACHE['t'] < 2.0:
+        return _ASSET_CACHE['v']
+    data_path = DATA_DIR
     if not os.path.exists(data_path): return []
-    for item in os.listdir(data_path):
-        if os.path.isdir(os.path.join(data_path, item)) and item.endswith('_resampled'):
-            available_assets.append(item.replace('_resampled', ''))
-    return sorted(available_assets)
+    with os.scandir(data_path) as it:
+        assets = sorted(
+            entry.name[:-len('_resampled')]
+            for entry in it
+            if entry.name.endswith('_resampled') and entry.is_dir()
+        )
+    _ASSET_CACHE.update(t=now, v=assets)
+    return assets
 
 class AuditUI(tk.Toplevel):
     """
@@ -114,6 +238,7 @@ class AuditUI(tk.Toplevel):
         self.title("Final Data Audit Tool")
         self.geometry("500x400")
         self.analysis_thread = None
+        self._log_queue = queue.SimpleQueue()
         
         main_frame = ttk.Frame(self, padding="10")
         main_frame.pack(fill="both", expand=True)
@@ -126,6 +251,11 @@ class AuditUI(tk.Toplevel):
         self.asset_dropdown.grid(row=1, column=0, columnspan=2, sticky="ew")
         self.run_button = ttk.Button(controls_frame, text="Generate Audit Report", command=self.start_analysis)
         self.run_button.grid(row=2, column=0, columnspan=2, pady=10)
+        # Arrow/feather output for downstream Python tools; skips the whole
+        # xlsx serialization.
+        self.fast_button = ttk.Button(controls_frame, text="Generate Fast Audit (feather)",
+                                      command=lambda: self.start_analysis(write_excel=False))
+        self.fast_button.grid(row=3, column=0, columnspan=2, pady=(0, 10))
         controls_frame.grid_columnconfigure(0, weight=1)
 
         log_frame = ttk.LabelFrame(main_frame, text="Status Log")
@@ -137,15 +267,26 @@ class AuditUI(tk.Toplevel):
         self.back_button.pack(pady=(10, 0))
 
         self.populate_assets()
+        self.after(50, self._drain_log)
 
     def update_log(self, message):
-        def task():
+        # Enqueue only; _drain_log flushes all pending lines in one insert.
+        self._log_queue.put(message)
+
+    def _drain_log(self):
+        lines = []
+        while True:
             try:
+                lines.append(self._log_queue.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            if lines:
                 self.log_widget.config(state='normal')
-                self.log_widget.insert(tk.END, message + "\n")
+                self.log_widget.insert(tk.END, "\n".join(lines) + "\n")
                 self.log_widget.config(state='disabled'); self.log_widget.see(tk.END)
-            except TclError: pass
-        self.after(0, task)
+            self.after(50, self._drain_log)
+        except TclError: pass
 
     def on_closing(self):
         if self.analysis_thread and self.analysis_thread.is_alive():
@@ -153,10 +294,10 @@ class AuditUI(tk.Toplevel):
         self.destroy()
         if hasattr(self, 'master_app') and self.master_app: self.master_app.deiconify()
 
-    def analysis_logic(self, folder_path):
+    def analysis_logic(self, folder_path, write_excel=True):
         log_callback = lambda msg: self.update_log(msg)
         try:
-            success, result_path = run_analysis(folder_path, status_callback=log_callback)
+            success, result_path = run_analysis(folder_path, status_callback=log_callback, write_excel=write_excel)
             if success:
                 self.after(0, lambda p=result_path: self.on_success(p))
             else:
@@ -171,29 +312,38 @@ class AuditUI(tk.Toplevel):
         if messagebox.askyesno("Success", f"Audit report saved to:\n{report_path}\n\nDo you want to open it now?"):
             open_file(report_path)
 
-    def start_analysis(self):
+    def start_analysis(self, write_excel=True):
         asset_name = self.asset_var.get()
         if not asset_name:
             messagebox.showerror("Error", "Please select an asset to audit."); return
 
         folder_name = f"{asset_name}_resampled"
-        folder_path = os.path.join(project_root, 'Data', folder_name)
+        folder_path = os.path.join(DATA_DIR, folder_name)
         if not os.path.isdir(folder_path):
             messagebox.showerror("Error", f"Could not find resampled folder:\n{folder_path}"); return
         
         self.run_button.config(text="Analyzing...", state="disabled")
+        self.fast_button.config(state="disabled")
         self.log_widget.config(state='normal'); self.log_widget.delete('1.0', tk.END); self.log_widget.config(state='disabled')
         
-        self.analysis_thread = threading.Thread(target=self.analysis_logic, args=(folder_path,), daemon=True)
+        self.analysis_thread = threading.Thread(target=self.analysis_logic, args=(folder_path, write_excel), daemon=True)
         self.analysis_thread.start()
 
     def on_task_complete(self):
         try:
             self.run_button.config(text="Generate Audit Report", state="normal")
+            self.fast_button.config(state="normal")
             self.analysis_thread = None
         except TclError: pass
 
     def populate_assets(self):
+        # Debounce: rapid dropdown opens coalesce into one scan per window.
+        if getattr(self, '_populate_after', None):
+            self.after_cancel(self._populate_after)
+        self._populate_after = self.after(500, self._do_populate_assets)
+
+    def _do_populate_assets(self):
+        self._populate_after = None
         assets = get_available_resampled_assets()
         self.asset_dropdown['values'] = assets
         if assets and not self.asset_var.get(): self.asset_dropdown.current(0)
\ No newline at end of file
@@ -4,15 +4,11 @@ from tkinter import ttk, filedialog, messagebox, scrolledtext, TclError
 import os
 import sys
 import threading
+import queue
+import time
 
 # --- THIS IS THE FIX ---
-def get_project_root():
-    """Gets the project root, handling both script and frozen exe."""
-    if getattr(sys, 'frozen', False):
-        return os.path.dirname(sys.executable)
-    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-
-project_root = get_project_root()
+from UI._paths import PROJECT_ROOT as project_root, DATA_DIR
 # --- END OF FIX ---
 
 if project_root not in sys.path: sys.path.insert(0, project_root)
@@ -20,17 +16,26 @@ if project_root not in sys.path: sys.path.insert(0, project_root)
 from Core.resampler import run_resampling
 
 # ... (The rest of this file is now correct and doesn't need changes) ...
+# Short-lived cache: the combobox postcommand re-scans on every dropdown
+# open, which is wasted syscall traffic when nothing changed.
+_ASSET_CACHE = {'t': 0.0, 'v': []}
+
 def get_available_healed_assets():
-    data_path = os.path.join(project_root, 'Data')
+    now = time.monotonic()
+    if now - _ASSET_CACHE['t'] < 2.0:
+        return _ASSET_CACHE['v']
+    data_path = DATA_DIR
     available_assets = set()
     if not os.path.exists(data_path): return []
-    for filename in os.listdir(data_path):
-        if filename.endswith('_healed.parquet') and os.path.isfile(os.path.join(data_path, filename)):
-            try:
-                parts = filename.split('_'); asset_name = f"{parts[0]}_{parts[1]}"
-                available_assets.add(asset_name)
-            except IndexError: continue
-    return sorted(list(available_assets))
+    with os.scandir(data_path) as it:
+        for entry in it:
+            name = entry.name
+            if not name.endswith('_healed.parquet') or not entry.is_file(follow_symlinks=False): continue
+            parts = name.split('_', 2)
+            if len(parts) >= 2: available_assets.add(f"{parts[0]}_{parts[1]}")
+    assets = sorted(available_assets)
+    _ASSET_CACHE.update(t=now, v=assets)
+    return assets
 
 class ResamplerUI(tk.Toplevel):
     """
@@ -45,6 +50,7 @@ class ResamplerUI(tk.Toplevel):
         self.title("Step 3: Timeframe Resampler")
         self.geometry("500x400")
         self.resampling_thread = None
+        self._log_queue = queue.SimpleQueue()
         
         main_frame = ttk.Frame(self, padding="10")
         main_frame.pack(fill="both", expand=True)
@@ -68,15 +74,26 @@ class ResamplerUI(tk.Toplevel):
         self.back_button.pack(pady=(10, 0))
 
         self.populate_assets()
+        self.after(50, self._drain_log)
 
     def update_log(self, message):
-        def task():
+        # Enqueue only; _drain_log flushes all pending lines in one insert.
+        self._log_queue.put(message)
+
+    def _drain_log(self):
+        lines = []
+        while True:
             try:
+                lines.append(self._log_queue.get_nowait())
+            except queue.Empty:
+                break
+        try:
+            if lines:
                 self.log_widget.config(state='normal')
-                self.log_widget.insert(tk.END, message + "\n")
+                self.log_widget.insert(tk.END, "\n".join(lines) + "\n")
                 self.log_widget.config(state='disabled'); self.log_widget.see(tk.END)
-            except TclError: pass
-        self.after(0, task)
+            self.after(50, self._drain_log)
+        except TclError: pass
 
     def on_closing(self):
         if self.resampling_thread and self.resampling_thread.is_alive():
@@ -105,7 +122,7 @@ class ResamplerUI(tk.Toplevel):
         if not asset_name:
             messagebox.showerror("Error", "Please select an asset to resample."); return
 
-        data_path = os.path.join(project_root, 'Data')
+        data_path = DATA_DIR
         healed_filename = next((f for f in os.listdir(data_path) if f.startswith(asset_name) and f.endswith('_healed.parquet')), None)
         if not healed_filename:
             messagebox.showerror("Error", f"Could not find a healed file for '{asset_name}'."); return
@@ -124,6 +141,13 @@ class ResamplerUI(tk.Toplevel):
         except TclError: pass
 
     def populate_assets(self):
+        # Debounce: rapid dropdown opens coalesce into one scan per window.
+        if getattr(self, '_populate_after', None):
+            self.after_cancel(self._populate_after)
+        self._populate_after = self.after(500, self._do_populate_assets)
+
+    def _do_populate_assets(self):
+        self._populate_after = None
         assets = get_available_healed_assets()
         self.asset_dropdown['values'] = assets
         if assets and not self.asset_var.get(): self.asset_dropdown.current(0)
@@ -4,6 +4,7 @@ from tkinter import ttk, messagebox, scrolledtext, TclError
 import os
 import sys
 import threading
+import queue
 
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if project_root not in sys.path:
@@ -25,6 +26,7 @@ class StrategyMakerUI(tk.Toplevel):
         self.title("Baseline Strategy Maker")
         self.geometry("500x450")
         self.generation_thread = None
+        self._log_queue = queue.SimpleQueue()
         
         main_frame = ttk.Frame(self, padding="10")
         main_frame.pack(fill="both", expand=True)
@@ -64,16 +66,27 @@ class StrategyMakerUI(tk.Toplevel):
         self.back_button.grid(row=7, column=0, columnspan=2, pady=(10, 0))
 
         main_frame.grid_columnconfigure(1, weight=1)
+        self.after(50, self._drain_log)
 
     def update_log(self, message):
-        def task():
+        # Enqueue only; _drain_log flushes all pending lines in one insert.
+        self._log_queue.put(message)
+
+    def _drain_log(self):
+        lines = []
+        while True:
             try:
+                lines.append(self._log_queue.get_nowait().strip())
+            except queue.Empty:
+                break
+        try:
+            if lines:
                 self.log_widget.config(state='normal')
-                self.log_widget.insert(tk.END, message.strip() + "\n")
+                self.log_widget.insert(tk.END, "\n".join(lines) + "\n")
                 self.log_widget.config(state='disabled')
                 self.log_widget.see(tk.END)
-            except TclError: pass
-        self.after(0, task)
+            self.after(50, self._drain_log)
+        except TclError: pass
 
     def on_closing(self):
         if self.generation_thread and self.generation_thread.is_alive():
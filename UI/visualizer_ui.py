@@ -3,25 +3,22 @@ import tkinter as tk
 from tkinter import ttk, messagebox, TclError, scrolledtext
 from tkcalendar import DateEntry
 import os
+import functools
 import importlib
 import sys
 import pandas as pd
 import numpy as np
 import threading
+import queue
 import traceback
 import pkgutil
 import Strategies
+from concurrent.futures import ProcessPoolExecutor
 
 from typing import List, Optional
 
 # --- THIS IS THE FIX ---
-def get_project_root():
-    """Gets the project root, handling both script and frozen exe."""
-    if getattr(sys, 'frozen', False):
-        return os.path.dirname(sys.executable)
-    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-
-project_root = get_project_root()
+from UI._paths import PROJECT_ROOT as project_root, DATA_DIR
 # --- END OF FIX ---
 
 if project_root not in sys.path:
@@ -30,8 +27,7 @@ if project_root not in sys.path:
 from Core.data_handler import load_unified_data
 from Core.backtester import run_r_backtest
 from Core.visualizer import plot_day_summary, open_file
-from Core.strategy_base import BaseStrategy
-import inspect
+from Core.strategy_base import BaseStrategy, StrategyConditions
 from typing import Optional, List
 
 ASSET_CONFIG = {
@@ -42,13 +38,41 @@ ASSET_CONFIG = {
     'USD_CAD': {'base_tf': '30s'},
 }
 
+@functools.lru_cache(maxsize=4)
+def _discover_strategy_modules(mtime_key: float) -> tuple:
+    """Walks the Strategies package for strategy_* modules.
+
+    Keyed on the package directory's mtime so the FileFinder walk reruns
+    only after a strategy file is added, removed, or touched; any UI that
+    needs the module list shares the same cache.
+    """
+    strats = []
+    for importer, modname, ispkg in pkgutil.walk_packages(path=Strategies.__path__, prefix=Strategies.__name__ + '.', onerror=lambda x: None):
+        if modname.split('.')[-1].startswith('strategy_'):
+            strats.append(modname)
+    return tuple(sorted(strats))
+
+def _new_candle_mask(a: np.ndarray) -> np.ndarray:
+    """True where a value differs from its predecessor (first row is True).
+
+    Equivalent to ``series.ne(series.shift(1))`` without the shifted-Series
+    allocation or pandas alignment machinery.
+    """
+    mask = np.empty(a.shape, dtype=bool)
+    mask[0] = True
+    np.not_equal(a[1:], a[:-1], out=mask[1:])
+    return mask
+
 def get_available_assets():
-    data_path = os.path.join(project_root, 'Data')
     available_assets = []
-    if os.path.exists(data_path):
-        for folder_name in os.listdir(data_path):
-            if folder_name.endswith('_resampled') and os.path.isdir(os.path.join(data_path, folder_name)):
-                asset_name = folder_name.replace('_resampled', '')
+    try:
+        it = os.scandir(DATA_DIR)
+    except FileNotFoundError:
+        return available_assets
+    with it as entries:
+        for entry in entries:
+            if entry.name.endswith('_resampled') and entry.is_dir(follow_symlinks=False):
+                asset_name = entry.name[:-len('_resampled')]
                 if asset_name in ASSET_CONFIG:
                     available_assets.append(asset_name)
     return sorted(available_assets)
@@ -67,6 +91,14 @@ class VisualizerUI(tk.Toplevel):
         self.geometry("500x550")
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
         self.backtest_thread = None
+        self._log_queue = queue.SimpleQueue()
+        # Discovery caches: re-walking the Strategies package / Data folder on
+        # every dropdown open is wasted work unless the directory changed.
+        self._asset_cache = None
+        self._assets_mtime = None
+        self._mod_mtime = {}
+        self._strategy_cls_cache = {}
+        self._render_pool = None
 
         main_frame = ttk.Frame(self, padding="10")
         main_frame.pack(fill="both", expand=True)
@@ -112,34 +144,50 @@ class VisualizerUI(tk.Toplevel):
         main_frame.grid_columnconfigure(1, weight=1)
         self.populate_assets()
         self.populate_strategies()
+        self.after(50, self._drain_log)
 
     def update_log(self, message):
-        def task():
+        # Enqueue only; _drain_log flushes all pending lines in one insert.
+        self._log_queue.put(message)
+
+    def _drain_log(self):
+        lines = []
+        while True:
             try:
+                lines.append(self._log_queue.get_nowait().strip())
+            except queue.Empty:
+                break
+        try:
+            if lines:
                 self.log_widget.config(state='normal')
-                self.log_widget.insert(tk.END, message.strip() + "\n")
+                self.log_widget.insert(tk.END, "\n".join(lines) + "\n")
                 self.log_widget.config(state='disabled')
                 self.log_widget.see(tk.END)
-            except TclError: pass
-        self.after(0, task)
+            self.after(50, self._drain_log)
+        except TclError: pass
 
     def on_closing(self):
         if self.backtest_thread and self.backtest_thread.is_alive():
             if not messagebox.askokcancel("Quit?", "A chart is being generated. Are you sure you want to quit?"): return
+        if self._render_pool is not None:
+            self._render_pool.shutdown(wait=False, cancel_futures=True)
         self.destroy()
         if hasattr(self, 'master_app') and self.master_app: self.master_app.deiconify()
 
     def populate_assets(self):
-        assets = get_available_assets()
+        try: dir_mtime = os.path.getmtime(DATA_DIR)
+        except OSError: dir_mtime = None
+        if self._asset_cache is None or dir_mtime != self._assets_mtime:
+            self._asset_cache = get_available_assets()
+            self._assets_mtime = dir_mtime
+        assets = self._asset_cache
         self.asset_dropdown['values'] = assets
         if assets: self.asset_dropdown.current(0)
 
     def populate_strategies(self):
-        strats = []
-        for importer, modname, ispkg in pkgutil.walk_packages(path=Strategies.__path__, prefix=Strategies.__name__ + '.', onerror=lambda x: None):
-            if modname.split('.')[-1].startswith('strategy_'):
-                strats.append(modname)
-        self.strategy_dropdown['values'] = sorted(strats)
+        dir_mtime = max(os.path.getmtime(p) for p in Strategies.__path__)
+        strats = _discover_strategy_modules(dir_mtime)
+        self.strategy_dropdown['values'] = strats
         if strats and not self.strategy_var.get(): self.strategy_dropdown.current(0)
 
     def get_strategy_instance(self, module_path: str) -> Optional[BaseStrategy]:
@@ -148,9 +196,19 @@ class VisualizerUI(tk.Toplevel):
             return None
         try:
             module = importlib.import_module(module_path)
-            importlib.reload(module)
-            for name, obj in inspect.getmembers(module):
-                if inspect.isclass(obj) and issubclass(obj, BaseStrategy) and obj is not BaseStrategy:
+            # Only pay for a reload when the source file actually changed.
+            path = getattr(module, '__file__', None)
+            mtime = os.path.getmtime(path) if path else None
+            if mtime and self._mod_mtime.get(module_path) != mtime:
+                importlib.reload(module)
+                self._mod_mtime[module_path] = mtime
+            cache_key = (module_path, mtime)
+            strategy_class = self._strategy_cls_cache.get(cache_key)
+            if strategy_class is not None:
+                return strategy_class()
+            for obj in vars(module).values():
+                if isinstance(obj, type) and issubclass(obj, BaseStrategy) and obj is not BaseStrategy:
+                    self._strategy_cls_cache[cache_key] = obj
                     return obj()
         except (ImportError, AttributeError) as e:
             print(f"Could not get strategy instance from {module_path}: {e}")
@@ -174,53 +232,72 @@ class VisualizerUI(tk.Toplevel):
             strategy_instance = self.get_strategy_instance(strategy_path)
             if not strategy_instance: raise ValueError(f"Could not load strategy from {strategy_path}")
 
-            # Filter data for the target day
-            full_unified_df['ny_time'] = full_unified_df.index.tz_convert('America/New_York')
-            day_data_df = full_unified_df[full_unified_df['ny_time'].dt.date == target_date].copy()
+            signal_tf = strategy_instance.STRATEGY_TIMEFRAME
+            execution_timeframe = ASSET_CONFIG[asset_name]['base_tf']
+
+            # Project down to the columns this run reads (strategy inputs plus
+            # the signal/execution timeframe OHLCV) before touching the rows.
+            needed = set(strategy_instance.required_columns())
+            for tf in (signal_tf, execution_timeframe):
+                needed |= {f'{col}_{tf}' for col in ('open', 'high', 'low', 'close', 'volume')}
+            full_unified_df = full_unified_df[[c for c in full_unified_df.columns if c in needed]]
+
+            # Filter data for the target day by slicing the sorted index at the
+            # NY-day boundaries; no whole-column tz_convert or .dt.date objects.
+            # Next calendar midnight, not start + 24h: NY days around DST
+            # transitions are 23 or 25 hours long.
+            day_start = pd.Timestamp(target_date, tz='America/New_York')
+            day_end = pd.Timestamp(target_date + pd.Timedelta(days=1), tz='America/New_York')
+            lo = full_unified_df.index.searchsorted(day_start)
+            hi = full_unified_df.index.searchsorted(day_end)
+            day_data_df = full_unified_df.iloc[lo:hi].copy()
             if day_data_df.empty: raise ValueError(f"No data found for {target_date} in the unified file.")
+            day_data_df['ny_time'] = day_data_df.index.tz_convert('America/New_York')
             
             # Generate signals
-            conditions_df = strategy_instance.generate_conditions(day_data_df.copy(), strategy_params={})
-            signal_tf = strategy_instance.STRATEGY_TIMEFRAME
-            
-            # Combine signals
-            final_mask = conditions_df['base_pattern_cond']
-            if 'session_cond' in conditions_df.columns:
-                final_mask &= conditions_df['session_cond']
+            conditions_df = strategy_instance.generate_conditions(day_data_df, strategy_params={})
+
+            # Combine signals on the SoA view: one column extraction, then
+            # pure ndarray ops with no pandas dispatch.
+            cond = StrategyConditions.from_frame(conditions_df)
+            final_mask = cond.base_pattern_cond.copy()
+            if cond.session_cond is not None:
+                final_mask &= cond.session_cond
             open_col = f'open_{signal_tf}'
-            is_new_candle_start = day_data_df[open_col].ne(day_data_df[open_col].shift(1))
-            final_mask &= is_new_candle_start
-            
-            long_signal_mask = final_mask & conditions_df['is_bullish']
-            short_signal_mask = final_mask & conditions_df['is_bearish']
+            final_mask &= _new_candle_mask(day_data_df[open_col].to_numpy())
 
-            signals_df = pd.DataFrame(index=day_data_df.index)
-            signals_df['signal'] = np.where(long_signal_mask, 1, np.where(short_signal_mask, -1, 0))
-            signals_df['entry_price'] = np.where(long_signal_mask, conditions_df['entry_price'], np.where(short_signal_mask, conditions_df['entry_price'], np.nan))
-            signals_df['sl_price'] = np.where(long_signal_mask, conditions_df['sl_price_long'], np.where(short_signal_mask, conditions_df['sl_price_short'], np.nan))
+            lm = final_mask & cond.is_bullish
+            sm = final_mask & cond.is_bearish
 
-            day_data_df['signal'] = signals_df['signal']
-            day_data_df['entry_price'] = signals_df['entry_price']
-            day_data_df['sl_price'] = signals_df['sl_price']
+            day_data_df['signal'] = lm.astype(np.int8) - sm.astype(np.int8)
+            day_data_df['entry_price'] = np.where(lm | sm, cond.entry_price, np.nan)
+            day_data_df['sl_price'] = np.where(lm, cond.sl_price_long, np.where(sm, cond.sl_price_short, np.nan))
             
             # Run a one-day backtest
-            execution_timeframe = ASSET_CONFIG[asset_name]['base_tf']
             trades_df = run_r_backtest(day_data_df, rr, use_be, rr / 2.0, execution_timeframe, allow_multiple_trades=True, status_callback=log_callback)
             
             # Prepare data for plotting
             log_callback("Preparing data for visualization...")
             plot_cols = [f'open_{signal_tf}', f'high_{signal_tf}', f'low_{signal_tf}', f'close_{signal_tf}', f'volume_{signal_tf}']
-            if not all(col in day_data_df.columns for col in plot_cols):
-                raise KeyError(f"One or more required columns for timeframe '{signal_tf}' not found in the data.")
+            missing = set(plot_cols).difference(day_data_df.columns)
+            if missing:
+                raise KeyError(f"Missing columns for timeframe '{signal_tf}': {sorted(missing)}")
 
-            temp_df = day_data_df[plot_cols + ['ny_time']].copy()
-            is_new_signal_candle = temp_df[f'open_{signal_tf}'].ne(temp_df[f'open_{signal_tf}'].shift())
-            plot_df = temp_df[is_new_signal_candle].copy()
+            # No .copy(): temp_df is read-only here; plot_df copies below.
+            temp_df = day_data_df.loc[:, plot_cols + ['ny_time']]
+            is_new_signal_candle = _new_candle_mask(temp_df[f'open_{signal_tf}'].to_numpy())
+            plot_df = temp_df.iloc[is_new_signal_candle].copy()
             plot_df.rename(columns={f'open_{signal_tf}': 'open', f'high_{signal_tf}': 'high', f'low_{signal_tf}': 'low', f'close_{signal_tf}': 'close', f'volume_{signal_tf}': 'volume'}, inplace=True)
             log_callback(f"Prepared {len(plot_df)} unique candles for {signal_tf} chart visualization.")
             
             strategy_name_for_plot = strategy_path.split('.')[-1]
-            saved_image_path = plot_day_summary(plot_df, trades_df, asset_name, strategy_name_for_plot, date_obj.strftime('%Y-%m-%d'))
+            # Render in a separate process so the chart write doesn't hold
+            # this process's GIL while Tk is pumping events.
+            if self._render_pool is None:
+                self._render_pool = ProcessPoolExecutor(max_workers=1)
+            saved_image_path = self._render_pool.submit(
+                plot_day_summary, plot_df, trades_df, asset_name, strategy_name_for_plot, date_obj.isoformat()
+            ).result()
             
             self.after(0, self.on_backtest_complete, saved_image_path)
 
@@ -5,6 +5,7 @@ from tkinter import font as tkfont
 import importlib
 import sys
 import os
+import threading
 import traceback
 from dotenv import load_dotenv, find_dotenv
 
@@ -116,19 +117,28 @@ class MasterUI(tk.Tk):
         data_frame = ttk.LabelFrame(main_frame, text="Data Management", padding=15)
         data_frame.grid(row=0, column=0, padx=10, pady=10, sticky="nsew")
         data_frame.grid_columnconfigure(0, weight=1)
-        
-        ttk.Button(data_frame, text="Data Manager", command=self.launch_downloader).grid(row=0, column=0, pady=5, sticky="ew")
-        ttk.Button(data_frame, text="Healer (Manual)", command=self.launch_healer).grid(row=1, column=0, pady=5, sticky="ew")
-        ttk.Button(data_frame, text="Resampler (Manual)", command=self.launch_resampler).grid(row=2, column=0, pady=5, sticky="ew")
-        ttk.Button(data_frame, text="Final Check", command=self.launch_checker).grid(row=3, column=0, pady=5, sticky="ew")
 
         backtest_frame = ttk.LabelFrame(main_frame, text="Analysis & Backtesting", padding=15)
         backtest_frame.grid(row=0, column=1, padx=10, pady=10, sticky="nsew")
         backtest_frame.grid_columnconfigure(0, weight=1)
 
-        ttk.Button(backtest_frame, text="Baseline Strategy Maker", command=self.launch_strategy_maker).grid(row=0, column=0, pady=5, sticky="ew")
-        ttk.Button(backtest_frame, text="Backtester", command=self.launch_backtester).grid(row=1, column=0, pady=5, sticky="ew")
-        ttk.Button(backtest_frame, text="Visualizer", command=self.launch_visualizer).grid(row=2, column=0, pady=5, sticky="ew")
+        # Data-driven button rows; BT_LIGHT_UI swaps in plain tk.Button to
+        # skip the per-widget ttk style lookups on slow first launches.
+        button_cls = tk.Button if os.environ.get('BT_LIGHT_UI') else ttk.Button
+        data_buttons = (
+            ("Data Manager", self.launch_downloader),
+            ("Healer (Manual)", self.launch_healer),
+            ("Resampler (Manual)", self.launch_resampler),
+            ("Final Check", self.launch_checker),
+        )
+        backtest_buttons = (
+            ("Baseline Strategy Maker", self.launch_strategy_maker),
+            ("Backtester", self.launch_backtester),
+            ("Visualizer", self.launch_visualizer),
+        )
+        for frame, buttons in ((data_frame, data_buttons), (backtest_frame, backtest_buttons)):
+            for i, (text, command) in enumerate(buttons):
+                button_cls(frame, text=text, command=command).grid(row=i, column=0, pady=5, sticky="ew")
 
         # --- THIS IS THE RESTORED CLICKABLE LABEL ---
         hyperlink_font = tkfont.Font(self, family="Helvetica", size=10, underline=True)
@@ -137,6 +147,19 @@ class MasterUI(tk.Tk):
         edit_env_label.grid(row=1, column=0, columnspan=2, pady=(10, 0))
         edit_env_label.bind("<Button-1>", self.open_env_editor)
 
+        # Import the tool windows (and their pandas/numpy/plotly baggage) in
+        # the background so the first button click doesn't freeze the UI;
+        # launch_app still instantiates widgets on the Tk thread.
+        threading.Thread(target=self._prewarm_ui_modules, daemon=True).start()
+
+    def _prewarm_ui_modules(self):
+        for module_name in ('downloader_ui', 'healer_ui', 'resampler_ui', 'final_data_check',
+                            'backtester_ui', 'visualizer_ui', 'strategy_maker_ui'):
+            try:
+                importlib.import_module(f'UI.{module_name}')
+            except Exception:
+                pass
+
     def open_env_editor(self, event=None):
         """Opens the .env file editor window."""
         editor = EnvEditorUI(master=self)
@@ -156,7 +179,9 @@ class MasterUI(tk.Tk):
         self.withdraw()
         try:
             full_module_name = f"UI.{module_name}"
-            if full_module_name in sys.modules:
+            # Reloading on every open re-runs the whole module body; only
+            # developers iterating on a tool window need that (BT_DEV_RELOAD=1).
+            if os.environ.get('BT_DEV_RELOAD') and full_module_name in sys.modules:
                 importlib.reload(sys.modules[full_module_name])
             module = importlib.import_module(full_module_name)
             ui_class = getattr(module, class_name)
@@ -0,0 +1,8 @@
+import pandas as pd
+
+# Copy-on-Write lets the module/session-scoped fixtures share their frames
+# safely: a test that writes to a shared frame triggers a lazy copy instead
+# of every test paying for a defensive deep copy up front. pandas >= 3.0
+# always runs with CoW, so only opt in on older versions.
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option('mode.copy_on_write', True)
@@ -2,7 +2,7 @@ import pandas as pd
 import pytest
 from Core.analysis import get_performance_stats
 
-@pytest.fixture
+@pytest.fixture(scope='module')
 def sample_trades_df() -> pd.DataFrame:
     """Creates a sample DataFrame of trades for testing."""
     data = {
@@ -17,7 +17,7 @@ def sample_trades_df() -> pd.DataFrame:
     }
     return pd.DataFrame(data)
 
-@pytest.fixture
+@pytest.fixture(scope='module')
 def empty_trades_df() -> pd.DataFrame:
     """Creates an empty DataFrame."""
     return pd.DataFrame(columns=['Entry Time', 'R-Multiple'])
@@ -28,53 +28,51 @@ def test_get_performance_stats_with_data(sample_trades_df):
 
     # --- Test Overall Stats ---
     assert overall is not None
-    assert overall.loc[overall['Metric'] == 'Total Trades', 'Value'].iloc[0] == 5
-    assert overall.loc[overall['Metric'] == 'Winners', 'Value'].iloc[0] == 2
-    assert overall.loc[overall['Metric'] == 'Losers', 'Value'].iloc[0] == 2
-    assert overall.loc[overall['Metric'] == 'Break-Evens', 'Value'].iloc[0] == 1
-    assert overall.loc[overall['Metric'] == 'Win Rate (W/(W+L)) %', 'Value'].iloc[0] == "50.00"
-    assert overall.loc[overall['Metric'] == 'Total R Gain', 'Value'].iloc[0] == "3.00R"
+    stats = dict(zip(overall['Metric'], overall['Value']))
+    assert stats['Total Trades'] == 5
+    assert stats['Winners'] == 2
+    assert stats['Losers'] == 2
+    assert stats['Break-Evens'] == 1
+    assert stats['Win Rate (W/(W+L)) %'] == "50.00"
+    assert stats['Total R Gain'] == "3.00R"
 
     # --- Test Monthly Stats ---
     assert monthly is not None
     assert len(monthly) == 2
+    mstats = monthly.set_index('Month')
     # January
-    jan_stats = monthly[monthly['Month'] == '2023-01']
-    assert jan_stats['Trades'].iloc[0] == 3
-    assert jan_stats['W'].iloc[0] == 1
-    assert jan_stats['L'].iloc[0] == 1
-    assert jan_stats['BE'].iloc[0] == 1
-    assert jan_stats['Monthly R Gain'].iloc[0] == "1.00R"
+    assert mstats.loc['2023-01', 'Trades'] == 3
+    assert mstats.loc['2023-01', 'W'] == 1
+    assert mstats.loc['2023-01', 'L'] == 1
+    assert mstats.loc['2023-01', 'BE'] == 1
+    assert mstats.loc['2023-01', 'Monthly R Gain'] == "1.00R"
     # February
-    feb_stats = monthly[monthly['Month'] == '2023-02']
-    assert feb_stats['Trades'].iloc[0] == 2
-    assert feb_stats['W'].iloc[0] == 1
-    assert feb_stats['L'].iloc[0] == 1
-    assert feb_stats['BE'].iloc[0] == 0
-    assert feb_stats['Monthly R Gain'].iloc[0] == "2.00R"
+    assert mstats.loc['2023-02', 'Trades'] == 2
+    assert mstats.loc['2023-02', 'W'] == 1
+    assert mstats.loc['2023-02', 'L'] == 1
+    assert mstats.loc['2023-02', 'BE'] == 0
+    assert mstats.loc['2023-02', 'Monthly R Gain'] == "2.00R"
 
     # --- Test Daily Stats ---
     assert daily is not None
     assert len(daily) == 3 # Mon, Tue, Sun
+    dstats = daily.set_index('Day')
     # Monday
-    mon_stats = daily[daily['Day'] == 'Monday']
-    assert mon_stats['Trades'].iloc[0] == 2
-    assert mon_stats['W'].iloc[0] == 1
-    assert mon_stats['L'].iloc[0] == 1
-    assert mon_stats['Total R Gain'].iloc[0] == "1.00R"
+    assert dstats.loc['Monday', 'Trades'] == 2
+    assert dstats.loc['Monday', 'W'] == 1
+    assert dstats.loc['Monday', 'L'] == 1
+    assert dstats.loc['Monday', 'Total R Gain'] == "1.00R"
     # Tuesday
-    tue_stats = daily[daily['Day'] == 'Tuesday']
-    assert tue_stats['Trades'].iloc[0] == 1
-    assert tue_stats['W'].iloc[0] == 0
-    assert tue_stats['L'].iloc[0] == 0
-    assert tue_stats['BE'].iloc[0] == 1
-    assert tue_stats['Total R Gain'].iloc[0] == "0.00R"
+    assert dstats.loc['Tuesday', 'Trades'] == 1
+    assert dstats.loc['Tuesday', 'W'] == 0
+    assert dstats.loc['Tuesday', 'L'] == 0
+    assert dstats.loc['Tuesday', 'BE'] == 1
+    assert dstats.loc['Tuesday', 'Total R Gain'] == "0.00R"
     # Sunday
-    sun_stats = daily[daily['Day'] == 'Sunday']
-    assert sun_stats['Trades'].iloc[0] == 2
-    assert sun_stats['W'].iloc[0] == 1
-    assert sun_stats['L'].iloc[0] == 1
-    assert sun_stats['Total R Gain'].iloc[0] == "2.00R"
+    assert dstats.loc['Sunday', 'Trades'] == 2
+    assert dstats.loc['Sunday', 'W'] == 1
+    assert dstats.loc['Sunday', 'L'] == 1
+    assert dstats.loc['Sunday', 'Total R Gain'] == "2.00R"
 
 def test_get_performance_stats_empty_df(empty_trades_df):
     """Tests that the function handles an empty DataFrame gracefully."""
@@ -0,0 +1,21 @@
+import pytest
+
+# The benchmark fixture comes from the optional pytest-benchmark plugin;
+# without it this file skips instead of erroring on the missing fixture.
+pytest.importorskip("pytest_benchmark")
+
+from tests.test_strategy_pr import _DF, StrategyPR
+
+
+def test_generate_conditions_perf(benchmark):
+    """
+    Micro-benchmark on generate_conditions over the shared sample frame.
+
+    Run with --benchmark-autosave / --benchmark-compare to catch regressions
+    when the strategy internals change; a hard wall-clock threshold would be
+    machine-dependent, so correctness of the benchmarked call is asserted
+    instead.
+    """
+    strategy = StrategyPR()
+    conditions = benchmark(strategy.generate_conditions, _DF)
+    assert conditions['base_pattern_cond'].sum() == 1